@@ -0,0 +1,332 @@
+"""
+Load test for the API: seeds a database, drives the real FastAPI app
+in-process through an ASGI client at several concurrency levels, and prints
+per-endpoint latency percentiles, throughput and Mongo operation counts as
+JSON that can be diffed between commits.
+
+By default the data lives in a mongomock-motor stand-in; pass --mongo-uri to
+run against a real (throwaway) MongoDB, which is required for meaningful
+numbers. mongomock does not implement $lookup with a pipeline, so the
+scenarios rendering projects are skipped without --mongo-uri.
+
+Run from the backend directory:
+
+    python -m benchmarks.load --projects 500 --concurrency 1,10,50 --output bench.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+from db.database import get_db, get_read_db
+from db.indexes import ensure_indexes
+from main import app
+from models.project import Comment, Project, ProjectLike
+from models.user import User
+from services.auth import get_password_hash
+from services.response_cache import project_response_cache
+
+PASSWORD = "bench-password"
+
+current_endpoint = contextvars.ContextVar("current_endpoint", default="seed")
+
+
+class CountingCollection:
+    """
+    Collection proxy counting every operation issued while an endpoint runs
+    """
+
+    def __init__(self, collection, counts):
+        self._collection = collection
+        self._counts = counts
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self._counts[current_endpoint.get()][f"{self._collection.name}.{name}"] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class CountingDatabase:
+    def __init__(self, db, counts):
+        self._db = db
+        self._counts = counts
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], self._counts)
+
+    def __getattr__(self, name):
+        return CountingCollection(getattr(self._db, name), self._counts)
+
+
+def create_database(mongo_uri):
+    name = f"flancer_bench_{uuid.uuid4().hex[:8]}"
+    if mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_uri)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    return client, client[name]
+
+
+async def seed(db, users: int, projects: int, comments: int, likes: int, real_mongo: bool):
+    if real_mongo:
+        await ensure_indexes(db)
+
+    hashed_password = get_password_hash(PASSWORD)
+    user_docs = [
+        User(email=f"user{i}@example.com", name=f"User {i}", hashed_password=hashed_password).model_dump()
+        for i in range(users)
+    ]
+    await db.users.insert_many(user_docs)
+    user_ids = [user["id"] for user in user_docs]
+
+    now = datetime.now()
+    tech = ["python", "fastapi", "react", "mongodb", "go", "rust", "nextjs", "docker"]
+    project_docs, comment_docs, like_docs = [], [], []
+    for i in range(projects):
+        project = Project(
+            title=f"Bench project {i}",
+            description="A benchmark project description " * 10,
+            budget=random.randint(100, 20000),
+            tech_stack=random.sample(tech, 3),
+            user_id=random.choice(user_ids),
+            created_at=now - timedelta(minutes=i)
+        ).model_dump()
+        likers = random.sample(user_ids, min(likes, len(user_ids)))
+        project["likes_count"] = len(likers)
+        project["comment_count"] = comments
+        project_docs.append(project)
+        like_docs.extend(
+            ProjectLike(project_id=project["id"], user_id=user_id).model_dump() for user_id in likers
+        )
+        comment_docs.extend(
+            Comment(
+                project_id=project["id"],
+                user_id=random.choice(user_ids),
+                text=f"Comment {n}",
+                created_at=now - timedelta(minutes=i, seconds=n)
+            ).model_dump()
+            for n in range(comments)
+        )
+
+    await db.projects.insert_many(project_docs)
+    if comment_docs:
+        await db.comments.insert_many(comment_docs)
+    if like_docs:
+        await db.project_likes.insert_many(like_docs)
+    return user_docs, project_docs
+
+
+# Scenarios whose aggregation uses $lookup with a pipeline
+REAL_MONGO_SCENARIOS = {
+    "GET /api/projects",
+    "GET /api/projects?comments=3",
+    "GET /api/projects/{id}",
+    "GET /api/projects/user",
+}
+
+
+def build_scenarios(project_ids):
+    def pick():
+        return random.choice(project_ids)
+
+    return {
+        "GET /api/projects": lambda: ("GET", "/api/projects", None, False),
+        "GET /api/projects?comments=3": lambda: ("GET", "/api/projects?comments=3", None, False),
+        "GET /api/projects/{id}": lambda: ("GET", f"/api/projects/{pick()}?comments=10", None, False),
+        "GET /api/projects/{id}/comments": lambda: ("GET", f"/api/projects/{pick()}/comments", None, False),
+        "GET /api/projects/user": lambda: ("GET", "/api/projects/user", None, True),
+        "GET /api/projects/{id}/like": lambda: ("GET", f"/api/projects/{pick()}/like", None, True),
+        "POST /api/projects/{id}/like": lambda: ("POST", f"/api/projects/{pick()}/like", None, True),
+        "POST /api/projects/{id}/comments": lambda: ("POST", f"/api/projects/{pick()}/comments", {"text": "bench"}, True),
+        "GET /api/auth/me": lambda: ("GET", "/api/auth/me", None, True),
+    }
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run_endpoint(client, name, scenario, tokens, concurrency, requests, counts):
+    """
+    Issue the requests of one scenario; only successful responses count as
+    latency samples
+    """
+    latencies = []
+    errors = 0
+    issued = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors, issued
+        for _ in remaining:
+            method, url, body, auth = scenario()
+            headers = {"Authorization": f"Bearer {random.choice(tokens)}"} if auth else {}
+            token = current_endpoint.set(name)
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+            finally:
+                current_endpoint.reset(token)
+
+    counts[name].clear()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    ops = dict(counts[name])
+    return {
+        "requests": issued,
+        "errors": errors,
+        "error_rate": round(errors / issued, 4) if issued else 0.0,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(latencies_ms), 3) if latencies_ms else None,
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3) if latencies_ms else None,
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3) if latencies_ms else None,
+        "mongo_ops_per_request": round(sum(ops.values()) / issued, 2) if issued else 0.0,
+        "mongo_ops": ops,
+    }
+
+
+async def main(args):
+    random.seed(args.seed)
+    counts = defaultdict(Counter)
+    client, raw_db = create_database(args.mongo_uri)
+    db = CountingDatabase(raw_db, counts)
+
+    async def override_get_db():
+        return db
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    if args.no_response_cache:
+        project_response_cache.ttl = 0
+
+    try:
+        user_docs, project_docs = await seed(
+            raw_db, args.users, args.projects, args.comments, args.likes, bool(args.mongo_uri)
+        )
+        project_ids = [project["id"] for project in project_docs]
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            tokens = []
+            for user in user_docs[:args.sessions]:
+                response = await http.post(
+                    "/api/auth/token",
+                    data={"username": user["email"], "password": PASSWORD}
+                )
+                response.raise_for_status()
+                tokens.append(response.json()["access_token"])
+
+            scenarios = build_scenarios(project_ids)
+            if args.endpoints:
+                scenarios = {name: s for name, s in scenarios.items() if name in args.endpoints}
+            if not args.mongo_uri:
+                skipped = sorted(REAL_MONGO_SCENARIOS & set(scenarios))
+                if skipped:
+                    print(
+                        "Skipping scenarios that need --mongo-uri ($lookup with a pipeline): " + ", ".join(skipped),
+                        file=sys.stderr
+                    )
+                scenarios = {name: s for name, s in scenarios.items() if name not in REAL_MONGO_SCENARIOS}
+
+            results = {}
+            for concurrency in args.concurrency:
+                results[str(concurrency)] = {
+                    name: await run_endpoint(http, name, scenario, tokens, concurrency, args.requests, counts)
+                    for name, scenario in scenarios.items()
+                }
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        if args.mongo_uri:
+            await client.drop_database(raw_db.name)
+
+    report = {
+        "config": {
+            "backend": "mongodb" if args.mongo_uri else "mongomock",
+            "users": args.users,
+            "projects": args.projects,
+            "comments_per_project": args.comments,
+            "likes_per_project": args.likes,
+            "requests_per_endpoint": args.requests,
+            "response_cache": not args.no_response_cache,
+        },
+        "results": results,
+        "failed_scenarios": sorted({
+            f"{name} @ {concurrency}"
+            for concurrency, by_name in results.items()
+            for name, result in by_name.items()
+            if result["errors"]
+        }),
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+    if report["failed_scenarios"]:
+        print(
+            "Scenarios with failed requests (latencies cover successes only): "
+            + ", ".join(report["failed_scenarios"]),
+            file=sys.stderr
+        )
+        if not args.allow_errors:
+            return 1
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mongo-uri", help="Run against this MongoDB instead of mongomock-motor")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=20, help="Comments per project")
+    parser.add_argument("--likes", type=int, default=10, help="Likes per project")
+    parser.add_argument("--sessions", type=int, default=10, help="Users logged in to drive authenticated endpoints")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint per concurrency level")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 10, 50],
+        help="Comma separated concurrency levels"
+    )
+    parser.add_argument("--endpoints", nargs="*", help="Only run these scenario names")
+    parser.add_argument("--no-response-cache", action="store_true", help="Bypass the project response cache")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument(
+        "--allow-errors",
+        action="store_true",
+        help="Exit 0 even when some requests failed"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
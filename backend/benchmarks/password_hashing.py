@@ -0,0 +1,73 @@
+"""
+Event-loop latency under concurrent logins, with bcrypt run inline on the
+loop (the old behaviour) versus offloaded to the password executor.
+
+A probe task sleeps for a fixed tick and records how late it wakes up; any
+lateness is time the loop spent blocked and could not serve other requests.
+
+Run from the backend directory:
+
+    python -m benchmarks.password_hashing --logins 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from services.auth import get_password_hash, verify_password, verify_password_async
+
+TICK = 0.005
+
+
+async def probe_loop_lag(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def inline_login(password, hashed):
+    return verify_password(password, hashed)
+
+
+async def offloaded_login(password, hashed):
+    return await verify_password_async(password, hashed)
+
+
+async def run(login, logins: int, hashed: str) -> dict:
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(probe_loop_lag(stop, lags))
+    await asyncio.sleep(TICK * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login("secret-password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "logins": logins,
+        "wall_time_s": round(elapsed, 3),
+        "loop_lag_p50_ms": round(statistics.median(lags_ms), 2),
+        "loop_lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 2),
+        "loop_lag_max_ms": round(lags_ms[-1], 2),
+    }
+
+
+async def main(logins: int):
+    hashed = get_password_hash("secret-password")
+    results = {
+        "inline": await run(inline_login, logins, hashed),
+        "offloaded": await run(offloaded_login, logins, hashed),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20, help="Number of concurrent logins")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,90 @@
+"""
+Per-page serialization cost of project list responses: the old three-pass
+path (models.Project -> model_dump -> schemas.Project validation -> JSON)
+against the lean projection path (project_response -> FastJSONResponse)
+and the aggregation path, whose documents arrive response-shaped from Mongo
+and only need rendering.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --projects 100 --rounds 200
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from models.project import Project
+from schemas.project import Project as ProjectSchema
+from services.projects import PROJECT_PROJECTION, project_response
+from services.serialization import FastJSONResponse
+
+
+def make_docs(count: int) -> list:
+    now = datetime.now()
+    return [
+        {
+            "_id": uuid.uuid4().hex[:24],
+            "id": str(uuid.uuid4()),
+            "title": f"Project {i}",
+            "description": "Build a marketplace feature " * 20,
+            "budget": 500 + i,
+            "tech_stack": ["python", "fastapi", "mongodb", "react"],
+            "status": "OPEN",
+            "created_at": now - timedelta(minutes=i),
+            "user_id": str(uuid.uuid4()),
+            "images": [f"https://example.com/{i}/{n}.png" for n in range(3)],
+            "likes_count": i,
+            "comment_count": i // 2,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_page(docs: list) -> bytes:
+    projects = []
+    for doc in docs:
+        project_data = Project(**doc).model_dump()
+        project_data["likes"] = project_data.pop("likes_count")
+        projects.append(project_data)
+    validated = [ProjectSchema.model_validate(p) for p in projects]
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def lean_page(docs: list) -> bytes:
+    return FastJSONResponse([project_response(doc) for doc in docs]).body
+
+
+def aggregated_page(shaped_docs: list) -> bytes:
+    return FastJSONResponse(shaped_docs).body
+
+
+def main(count: int, rounds: int):
+    full_docs = make_docs(count)
+    projected_docs = [
+        {key: value for key, value in doc.items() if PROJECT_PROJECTION.get(key)}
+        for doc in full_docs
+    ]
+
+    legacy = timeit.timeit(lambda: legacy_page(full_docs), number=rounds) / rounds
+    lean = timeit.timeit(lambda: lean_page(projected_docs), number=rounds) / rounds
+    shaped_docs = [project_response(doc) for doc in projected_docs]
+    aggregated = timeit.timeit(lambda: aggregated_page(shaped_docs), number=rounds) / rounds
+    print(json.dumps({
+        "projects_per_page": count,
+        "legacy_ms_per_page": round(legacy * 1000, 3),
+        "lean_ms_per_page": round(lean * 1000, 3),
+        "aggregated_ms_per_page": round(aggregated * 1000, 3),
+        "speedup": round(legacy / lean, 2) if lean else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100, help="Projects per page")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages to serialize per path")
+    args = parser.parse_args()
+    main(args.projects, args.rounds)
@@ -0,0 +1,53 @@
+"""
+Throughput of get_current_user with and without the verified-token cache.
+
+The user cache is pre-warmed so no database is touched; what remains is JWT
+verification plus the cache lookups.
+
+Run from the backend directory:
+
+    python -m benchmarks.token_cache --calls 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import services.auth as auth
+from models.user import User
+
+
+async def measure(calls: int, token: str) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await auth.get_current_user(token=token, db=None)
+    return calls / (time.perf_counter() - started)
+
+
+async def main(calls: int):
+    user = User(email="bench@example.com", name="Bench", hashed_password="unused")
+    auth.cache_user(user)
+    token = auth.create_access_token(data={"sub": user.email})
+
+    cache_size = auth.token_cache.maxsize
+    auth.token_cache.maxsize = 0
+    auth.token_cache.clear()
+    uncached = await measure(calls, token)
+
+    auth.token_cache.maxsize = cache_size
+    cached = await measure(calls, token)
+
+    print(json.dumps({
+        "jwt_backend": "pyjwt" if auth.use_pyjwt else "python-jose",
+        "calls": calls,
+        "uncached_per_s": round(uncached),
+        "cached_per_s": round(cached),
+        "speedup": round(cached / uncached, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="get_current_user calls per run")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -1,16 +1,112 @@
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
+import logging
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReadPreference
 from dotenv import load_dotenv
 
+from db.monitoring import command_metrics, pool_stats
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "flancer")
 
-async_client = AsyncIOMotorClient(MONGO_URI)
-async_db = async_client[DATABASE_NAME]
-print("DB connected - Asynchronous client")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))
+# Comma separated, e.g. "zstd,snappy"; needs the matching pymongo extra installed
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+# Read preference for list/search endpoints that tolerate slightly stale data
+MONGO_LIST_READ_PREFERENCE = os.getenv("MONGO_LIST_READ_PREFERENCE", "primary")
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+async_client: Optional[AsyncIOMotorClient] = None
+async_db: Optional[AsyncIOMotorDatabase] = None
+read_db: Optional[AsyncIOMotorDatabase] = None
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "event_listeners": [command_metrics, pool_stats],
+    }
+    if MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+
+def connect() -> AsyncIOMotorDatabase:
+    """
+    Create the process-wide client. Called from the app lifespan and by
+    scripts, so nothing connects at import time.
+    """
+    global async_client, async_db, read_db
+    if async_client is not None:
+        return async_db
+
+    if MONGO_LIST_READ_PREFERENCE not in READ_PREFERENCES:
+        raise RuntimeError(f"Unknown MONGO_LIST_READ_PREFERENCE {MONGO_LIST_READ_PREFERENCE!r}")
+
+    async_client = AsyncIOMotorClient(MONGO_URI, **client_options())
+    async_db = async_client[DATABASE_NAME]
+    read_db = async_db.with_options(read_preference=READ_PREFERENCES[MONGO_LIST_READ_PREFERENCE])
+    logger.info(
+        "MongoDB client created (maxPoolSize=%d, minPoolSize=%d, compressors=%s, list reads=%s)",
+        MONGO_MAX_POOL_SIZE,
+        MONGO_MIN_POOL_SIZE,
+        MONGO_COMPRESSORS or "none",
+        MONGO_LIST_READ_PREFERENCE
+    )
+    return async_db
+
+
+def close() -> None:
+    global async_client, async_db, read_db
+    if async_client is not None:
+        async_client.close()
+    async_client = async_db = read_db = None
 
 
 async def get_db():
+    if async_db is None:
+        raise RuntimeError("MongoDB client is not connected")
     return async_db
+
+
+def list_reads_may_lag() -> bool:
+    """
+    Whether get_read_db() may be served by a secondary behind the primary
+    """
+    return MONGO_LIST_READ_PREFERENCE != "primary"
+
+
+async def get_read_db():
+    """
+    Database handle for list endpoints, honouring MONGO_LIST_READ_PREFERENCE.
+    Never use it for reads that must observe the caller's own writes.
+    """
+    if read_db is None:
+        raise RuntimeError("MongoDB client is not connected")
+    return read_db
+
+
+async def ping() -> None:
+    await async_client.admin.command("ping")
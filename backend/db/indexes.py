@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from services.sync import TOMBSTONE_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Every index the API relies on, per collection. Names are fixed so that the
+# provisioning below stays idempotent across restarts and workers.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_id_created_at"),
+        IndexModel([("tech_stack", ASCENDING), ("created_at", DESCENDING)], name="tech_stack_created_at"),
+        IndexModel([("trending_score", DESCENDING), ("id", DESCENDING)], name="trending_score_id"),
+        IndexModel([("updated_at", ASCENDING), ("id", ASCENDING)], name="updated_at_id"),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("tech_stack", TEXT)],
+            name="text_search",
+            weights={"title": 10, "tech_stack": 5, "description": 1}
+        ),
+    ],
+    "comments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("project_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="project_id_created_at_id"
+        ),
+    ],
+    "project_tombstones": [
+        IndexModel([("deleted_at", ASCENDING), ("id", ASCENDING)], name="deleted_at_id"),
+        IndexModel(
+            [("deleted_at", ASCENDING)],
+            name="deleted_at_ttl",
+            expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 24 * 3600
+        ),
+    ],
+    "project_likes": [
+        IndexModel([("project_id", ASCENDING), ("user_id", ASCENDING)], name="project_id_user_id_unique", unique=True),
+    ],
+}
+
+# Representative queries issued by the routes, as (collection, filter, sort).
+KNOWN_QUERIES = [
+    ("users", {"email": "user@example.com"}, None),
+    ("users", {"id": "user-id"}, None),
+    ("projects", {"id": "project-id"}, None),
+    ("projects", {}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("projects", {"budget": {"$gte": 0, "$lte": 1000}}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("projects", {"user_id": "user-id"}, [("created_at", DESCENDING)]),
+    ("projects", {"tech_stack": {"$in": ["python"]}}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("projects", {"trending_score": {"$gt": 0}}, [("trending_score", DESCENDING), ("id", DESCENDING)]),
+    ("projects", {"updated_at": {"$gt": datetime(1970, 1, 1)}}, [("updated_at", ASCENDING), ("id", ASCENDING)]),
+    ("project_tombstones", {"deleted_at": {"$gt": datetime(1970, 1, 1)}}, [("deleted_at", ASCENDING), ("id", ASCENDING)]),
+    ("comments", {"project_id": "project-id"}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("users", {"id": {"$in": ["user-id"]}}, None),
+    ("project_likes", {"project_id": "project-id", "user_id": "user-id"}, None),
+]
+
+
+# Server error codes for an index whose keys or name clash with an existing one
+INDEX_CONFLICT_CODES = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
+
+
+def _index_keys(index: IndexModel) -> tuple:
+    return tuple(index.document["key"].items())
+
+
+async def _create_each(collection, indexes: List[IndexModel]) -> List[str]:
+    """
+    Create indexes one by one, logging and skipping the ones that conflict
+    with an existing index instead of aborting startup
+    """
+    names = []
+    for index in indexes:
+        try:
+            names.extend(await collection.create_indexes([index]))
+        except OperationFailure as exc:
+            if exc.code not in INDEX_CONFLICT_CODES:
+                raise
+            logger.error(
+                "Index %s.%s conflicts with an existing index; drop or rename it to apply the declared one: %s",
+                collection.name,
+                index.document["name"],
+                exc
+            )
+    return names
+
+
+async def ensure_indexes(db) -> List[str]:
+    """
+    Create every declared index that does not exist yet, by name or by key
+    spec, and return the qualified names of the ones that were built
+    """
+    built = []
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        existing_keys = {tuple(info["key"]): name for name, info in existing.items()}
+        missing = []
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing:
+                continue
+            other = existing_keys.get(_index_keys(index))
+            if other is not None:
+                logger.warning(
+                    "Index %s.%s already exists as %s; keeping the existing index",
+                    collection_name,
+                    name,
+                    other
+                )
+                continue
+            missing.append(index)
+        if not missing:
+            continue
+        try:
+            names = await collection.create_indexes(missing)
+        except OperationFailure as exc:
+            if exc.code not in INDEX_CONFLICT_CODES:
+                raise
+            names = await _create_each(collection, missing)
+        built.extend(f"{collection_name}.{name}" for name in names)
+
+    if built:
+        logger.info("Built indexes: %s", ", ".join(built))
+    else:
+        logger.info("All indexes already present")
+    return built
+
+
+def _plan_stages(plan) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def check_query_plans(db) -> None:
+    """
+    Explain every known query and raise if any of them falls back to a
+    collection scan
+    """
+    collscans = []
+    for collection_name, query, sort in KNOWN_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            collscans.append(f"{collection_name} {query} sort={sort}")
+
+    if collscans:
+        raise RuntimeError("Queries doing a COLLSCAN: " + "; ".join(collscans))
+    logger.info("Query plan check passed for %d queries", len(KNOWN_QUERIES))
+
+
+async def _main(check: bool):
+    from db.database import connect, close
+
+    db = connect()
+    try:
+        await ensure_indexes(db)
+        if check:
+            await check_query_plans(db)
+    finally:
+        close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(check="--check" in sys.argv))
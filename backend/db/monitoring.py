@@ -0,0 +1,213 @@
+import contextvars
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+from services.metrics import db_command_duration, db_commands, slow_queries
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# Replies and handshakes are not interesting per-request work
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions"}
+
+
+class RequestDbStats:
+    """
+    Mongo work done on behalf of one HTTP request. Listener callbacks may run
+    on Motor's executor threads, so updates are guarded by a lock.
+    """
+
+    def __init__(self):
+        self.commands = 0
+        self.duration_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_command: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def record(self, command: str, duration_ms: float) -> None:
+        with self._lock:
+            self.commands += 1
+            self.duration_ms += duration_ms
+            if duration_ms > self.slowest_ms:
+                self.slowest_ms = duration_ms
+                self.slowest_command = command
+
+
+request_db_stats: contextvars.ContextVar[Optional[RequestDbStats]] = contextvars.ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def query_shape(value: Any) -> Any:
+    """
+    Replace literal values in a filter with their type names so slow-query
+    logs group by shape and never contain user data
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return f"<{type(value).__name__}>"
+    return f"<{type(value).__name__}>"
+
+
+def command_filter(command_name: str, command: Dict[str, Any]) -> Any:
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter", command.get("query"))
+    if command_name == "findAndModify":
+        return command.get("query")
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        return [stage for stage in pipeline if "$match" in stage or "$text" in stage][:1] or None
+    if command_name == "update":
+        updates = command.get("updates") or []
+        return updates[0].get("q") if updates else None
+    if command_name == "delete":
+        deletes = command.get("deletes") or []
+        return deletes[0].get("q") if deletes else None
+    return None
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Counts every command per request and process wide, and logs commands
+    slower than SLOW_QUERY_MS with the shape of their filter
+    """
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._started: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        shape = query_shape(command_filter(event.command_name, event.command))
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self._started[self._key(event)] = (collection if isinstance(collection, str) else None, shape)
+
+    def _finished(self, event, failed: bool) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        with self._lock:
+            collection, shape = self._started.pop(self._key(event), (None, None))
+
+        duration_ms = event.duration_micros / 1000
+        db_commands.inc(event.command_name)
+        db_command_duration.observe(duration_ms / 1000, event.command_name)
+
+        stats = request_db_stats.get()
+        if stats is not None:
+            stats.record(event.command_name, duration_ms)
+
+        if duration_ms >= self.slow_query_ms:
+            slow_queries.inc(event.command_name)
+            logger.warning(
+                "Slow Mongo command %s on %s.%s took %.1fms%s filter=%s",
+                event.command_name,
+                event.database_name,
+                collection,
+                duration_ms,
+                " (failed)" if failed else "",
+                shape
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event, failed=True)
+
+
+command_metrics = CommandMetrics()
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters per server address, for the readiness endpoint
+    and pool sizing
+    """
+
+    def __init__(self):
+        self._servers: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _server(self, address) -> dict:
+        key = f"{address[0]}:{address[1]}"
+        server = self._servers.get(key)
+        if server is None:
+            server = self._servers[key] = {
+                "open": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "created": 0,
+                "closed": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checkout_wait_ms_total": 0.0,
+                "checkout_wait_ms_max": 0.0,
+                "cleared": 0,
+            }
+        return server
+
+    def _update(self, address, **deltas) -> None:
+        with self._lock:
+            server = self._server(address)
+            for field, delta in deltas.items():
+                server[field] += delta
+            server["max_checked_out"] = max(server["max_checked_out"], server["checked_out"])
+
+    def pool_created(self, event):
+        self._update(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._update(event.address, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        # duration is only reported by pymongo 4.7+
+        wait_ms = (getattr(event, "duration", None) or 0.0) * 1000
+        self._update(event.address, checked_out=1, checkouts=1, checkout_wait_ms_total=wait_ms)
+        with self._lock:
+            server = self._server(event.address)
+            server["checkout_wait_ms_max"] = max(server["checkout_wait_ms_max"], wait_ms)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {address: dict(server) for address, server in self._servers.items()}
+
+
+pool_stats = PoolStats()
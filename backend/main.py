@@ -1,17 +1,100 @@
 import os
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
+from db import database
+from db.database import get_db
+from db.indexes import ensure_indexes, check_query_plans
+from db.monitoring import RequestDbStats, request_db_stats, pool_stats
 from routes.projects import router as projects_router
 from routes.auth import router as auth_router
+from services.auth import user_cache, token_cache, password_executor
+from services.cache import cache_backend
+from services.events import project_events_broker
+from services.like_buffer import LIKE_WRITE_MODE, like_buffer
+from services.trending import TRENDING_REBUILD_INTERVAL, run_trending_rebuilds
+from services.metrics import (
+    registry,
+    cache_gauges,
+    http_requests,
+    http_request_duration,
+    db_commands_per_request,
+    db_time_per_request
+)
 
 
 load_dotenv()
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+CHECK_QUERY_PLANS = os.getenv("CHECK_QUERY_PLANS", "false").lower() == "true"
+
+registry.gauge_callback(
+    "flancer_cache",
+    "Cache counters and sizes",
+    cache_gauges({
+        "users": user_cache.stats,
+        "tokens": token_cache.stats,
+        "shared": cache_backend.stats
+    })
+)
+registry.gauge_callback(
+    "flancer_event_stream",
+    "Live event subscribers and slow consumers dropped",
+    lambda: {
+        (("stat", stat),): value
+        for stat, value in project_events_broker.stats().items()
+        if stat != "source"
+    }
+)
+registry.gauge_callback(
+    "flancer_mongo_pool",
+    "MongoDB connection pool state per server",
+    lambda: {
+        (("server", server), ("stat", stat)): value
+        for server, stats in pool_stats.stats().items()
+        for stat, value in stats.items()
+    }
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.connect()
+    db = await get_db()
+    await ensure_indexes(db)
+    if CHECK_QUERY_PLANS:
+        await check_query_plans(db)
+    await cache_backend.start()
+    await project_events_broker.start(db)
+    if LIKE_WRITE_MODE == "buffered":
+        await like_buffer.start(db)
+    trending_task = None
+    if TRENDING_REBUILD_INTERVAL > 0:
+        trending_task = asyncio.create_task(run_trending_rebuilds(db))
+    yield
+    if trending_task is not None:
+        trending_task.cancel()
+        try:
+            await trending_task
+        except asyncio.CancelledError:
+            pass
+    await like_buffer.close()
+    await project_events_broker.close()
+    await cache_backend.close()
+    password_executor.shutdown(wait=False)
+    database.close()
+
 
 app = FastAPI(
     title="Flancer API",
     description="API for Flancer - A Freelance Project Marketplace",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -21,8 +104,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """
+    Count the Mongo commands each request issues and report them, with the
+    total handler time, in a Server-Timing header and the /metrics registry
+    """
+    stats = RequestDbStats()
+    token = request_db_stats.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        request_db_stats.reset(token)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        http_requests.inc(request.method, route, str(status_code))
+        http_request_duration.observe(elapsed, request.method, route)
+        db_commands_per_request.observe(stats.commands, route)
+        db_time_per_request.observe(stats.duration_ms / 1000, route)
+
+    timings = [
+        f'db;dur={stats.duration_ms:.1f};desc="{stats.commands} commands"',
+        f"app;dur={elapsed * 1000:.1f}"
+    ]
+    if stats.slowest_command:
+        timings.insert(1, f'db-slowest;dur={stats.slowest_ms:.1f};desc="{stats.slowest_command}"')
+    response.headers["Server-Timing"] = ", ".join(timings)
+    return response
+
+
 app.include_router(auth_router, prefix="/api")
 app.include_router(projects_router, prefix="/api")
 
@@ -30,6 +147,43 @@ app.include_router(projects_router, prefix="/api")
 async def root():
     return {"message": "Welcome to Flancer API"}
 
+@app.get("/cache-stats")
+async def cache_stats():
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "shared": cache_backend.stats()
+    }
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: pings MongoDB and reports pool configuration and usage
+    so pools can be sized per worker
+    """
+    body = {
+        "pool": {
+            "max_pool_size": database.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": database.MONGO_MIN_POOL_SIZE,
+            "max_idle_time_ms": database.MONGO_MAX_IDLE_TIME_MS,
+            "compressors": database.MONGO_COMPRESSORS or None,
+            "list_read_preference": database.MONGO_LIST_READ_PREFERENCE,
+            "servers": pool_stats.stats()
+        }
+    }
+    try:
+        await database.ping()
+    except Exception as exc:
+        body["status"] = "unavailable"
+        body["error"] = str(exc)
+        return JSONResponse(body, status_code=503)
+    body["status"] = "ready"
+    return body
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -10,6 +10,7 @@ class ProjectStatus(str, Enum):
 
 class Comment(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    project_id: str
     user_id: str
     text: str
     created_at: datetime = Field(default_factory=datetime.now)
@@ -22,10 +23,22 @@ class Project(BaseModel):
     tech_stack: List[str]
     status: ProjectStatus = ProjectStatus.OPEN
     created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
     user_id: str
     images: List[str] = Field(default_factory=list)
-    likes: List[str] = Field(default_factory=list)  
-    comments: List[Comment] = Field(default_factory=list)
+    likes_count: int = 0
+    comment_count: int = 0
+    trending_score: float = 0.0
     
     class Config:
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True 
+
+class ProjectTombstone(BaseModel):
+    id: str
+    user_id: str
+    deleted_at: datetime = Field(default_factory=datetime.now)
+
+class ProjectLike(BaseModel):
+    project_id: str
+    user_id: str
+    created_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
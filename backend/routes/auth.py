@@ -1,11 +1,14 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from db.database import get_db
 from models.user import User
 from schemas.user import UserCreate, User as UserSchema, UserProfileUpdate, UserImageUpdate
-from services.auth import authenticate_user, create_access_token, get_password_hash, get_current_active_user
+from services.auth import authenticate_user, create_access_token, get_password_hash_async, get_current_active_user, invalidate_user
+from services.response_cache import invalidate_user_data
 
 router = APIRouter(
     prefix="/auth",
@@ -14,23 +17,23 @@ router = APIRouter(
 
 @router.post("/register", response_model=UserSchema)
 async def register_user(user: UserCreate, db = Depends(get_db)):
-    db_user = await db.users.find_one({"email": user.email})
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(
         email=user.email,
         name=user.name,
         hashed_password=hashed_password
     )
     
-    result = await db.users.insert_one(new_user.model_dump())
-    created_user = await db.users.find_one({"_id": result.inserted_id})
-    return User(**created_user)
+    # The unique index on users.email rejects duplicates atomically
+    try:
+        await db.users.insert_one(new_user.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    invalidate_user(new_user)
+    return new_user
 
 @router.post("/token")
 async def login_for_access_token(
@@ -60,13 +63,14 @@ async def update_profile(
     update_data = {k: v for k, v in profile_update.model_dump().items() if v is not None}
     if not update_data:
         return current_user
-    result = await db.users.update_one(
+    updated_user = await db.users.find_one_and_update(
         {"id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
-    if result.modified_count == 0:
-        raise HTTPException(status_code=400, detail="Profile not updated")
-    updated_user = await db.users.find_one({"id": current_user.id})
+    if updated_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await invalidate_user_data(current_user.id)
     return User(**updated_user)
 
 @router.patch("/profile/image", response_model=UserSchema)
@@ -75,11 +79,12 @@ async def update_profile_image(
     db = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    result = await db.users.update_one(
+    updated_user = await db.users.find_one_and_update(
         {"id": current_user.id},
-        {"$set": {"image": image_update.image_url}}
+        {"$set": {"image": image_update.image_url}},
+        return_document=ReturnDocument.AFTER
     )
-    if result.modified_count == 0:
-        raise HTTPException(status_code=400, detail="Profile image not updated")
-    updated_user = await db.users.find_one({"id": current_user.id})
+    if updated_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await invalidate_user_data(current_user.id)
     return User(**updated_user)
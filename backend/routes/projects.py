@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import ReturnDocument
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from db.database import get_db
-from models.project import Project, ProjectStatus, Comment
+from db.database import get_db, get_read_db, list_reads_may_lag
+from models.project import Project, ProjectStatus, ProjectTombstone, Comment
 from models.user import User
 from schemas.project import (
     Project as ProjectSchema, 
@@ -11,115 +14,267 @@ from schemas.project import (
     ProjectStatusUpdate,
     CommentCreate,
     CommentResponse,
-    ProjectLikeResponse
+    CommentPage,
+    ProjectLikeResponse,
+    ProjectSearchResponse,
+    BulkImportResponse,
+    ProjectChanges
 )
 from services.auth import get_current_active_user
+from services.events import (
+    comment_event,
+    likes_event,
+    project_events_broker,
+    status_event,
+    stream_events
+)
+from services.bulk import TooManyRows, export_projects, import_projects, iter_ndjson_lines
+from services.like_buffer import FlushTimeout, like_buffer
+from services.likes import toggle_like, get_like_state
+from services.pagination import keyset_filter, next_cursor
+from services.projects import (
+    PROJECT_PROJECTION,
+    build_project_filter,
+    fetch_project,
+    fetch_projects,
+    list_comments_page,
+    parse_fields,
+    project_response,
+    search_projects as run_project_search,
+    user_summary
+)
+from services.response_cache import (
+    LIST_TAG,
+    SECONDARY_READ_CACHE_TTL,
+    invalidate_project,
+    invalidate_project_lists,
+    project_response_cache,
+    response_tags
+)
+from services.serialization import FastJSONResponse
+from services.singleflight import SingleFlight
+from services.sync import list_changes
+from services.trending import TRENDING_SORT, comment_score
 
 router = APIRouter(
     prefix="/projects",
     tags=["projects"]
 )
 
+MAX_INLINE_COMMENTS = 20
+# Identical concurrent reads share one load; keys mirror the response cache keys
+project_flights = SingleFlight("projects")
+# Fields whose change can move a project in or out of a filtered list page
+LIST_FIELDS = {"budget", "tech_stack", "status"}
+
+def inline_comments_query():
+    return Query(0, ge=0, le=MAX_INLINE_COMMENTS, description="Number of latest comments to inline per project")
+
+def fields_query():
+    return Query(None, description="Comma separated response fields to return (id is always included)")
+
+async def raise_not_found_or_forbidden(db, project_id: str, action: str):
+    """
+    Called when an owner-filtered write matched nothing, to tell a missing
+    project (404) from someone else's (403)
+    """
+    existing_project = await db.projects.find_one({"id": project_id}, {"_id": 1})
+    if existing_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    raise HTTPException(status_code=403, detail=f"Not authorized to {action} this project")
+
 @router.get("", response_model=List[ProjectSchema])
 async def get_projects(
-    skip: int = 0,
-    limit: int = 10,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     tech_stack: Optional[str] = Query(None, description="Filter by tech stack (comma separated)"),
     min_budget: Optional[int] = Query(None, description="Filter by minimum budget"),
     max_budget: Optional[int] = Query(None, description="Filter by maximum budget"),
-    db = Depends(get_db)
+    status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
+    comments: int = inline_comments_query(),
+    fields: Optional[str] = fields_query(),
+    db = Depends(get_read_db)
 ):
     """
-    Get all projects with optional filtering and pagination
+    Get all projects with optional filtering and pagination.
+
+    Pass the ``X-Next-Cursor`` header of a page back as ``cursor`` to fetch the
+    next one; ``skip`` is still honoured when no cursor is given. ``fields``
+    trims each project to the listed fields.
     """
-    filter_query = {}
-    
-    if tech_stack:
-        tech_stack_list = [tech.strip() for tech in tech_stack.split(",")]
-        filter_query["tech_stack"] = {"$in": tech_stack_list}
-    
-    budget_filter = {}
-    if min_budget is not None:
-        budget_filter["$gte"] = min_budget
-    
-    if max_budget is not None:
-        budget_filter["$lte"] = max_budget
-    
-    if budget_filter:
-        filter_query["budget"] = budget_filter
-    projects_cursor = db.projects.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
-    
-    projects = []
-    async for project in projects_cursor:
-        proj = Project(**project)
-        
-        likes_count = len(proj.likes) if proj.likes else 0
-        
-        formatted_comments = []
-        if proj.comments:
-            for comment in proj.comments:
-                user = await db.users.find_one({"id": comment.user_id})
-                if user:
-                    user_info = {
-                        "id": user["id"],
-                        "name": user["name"],
-                        "image": user.get("image", None)
-                    }
-                    formatted_comments.append({
-                        "id": comment.id,
-                        "text": comment.text,
-                        "created_at": comment.created_at,
-                        "user": user_info
-                    })
-        
-         
-        project_data = proj.model_dump()
-        project_data["likes"] = likes_count
-        project_data["comments"] = formatted_comments
-        projects.append(project_data)
-    
-    return projects
+    if cursor:
+        skip = 0
+    selected = parse_fields(fields)
+    tech_key = tuple(sorted({tech.strip() for tech in tech_stack.split(",") if tech.strip()})) if tech_stack else ()
+    cache_key = ("projects", skip, cursor, limit, tech_key, min_budget, max_budget, status, comments, selected)
+    cached = await project_response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response(request)
+
+    async def load_page():
+        since = await project_response_cache.version()
+        filter_query = build_project_filter(tech_stack, min_budget, max_budget, status)
+        if cursor:
+            filter_query.update(keyset_filter(cursor))
+
+        # The next cursor is built from created_at even when it is not returned
+        load_fields = selected
+        if selected is not None and "created_at" not in selected:
+            load_fields = selected + ("created_at",)
+
+        projects = await fetch_projects(
+            db,
+            filter_query,
+            skip=skip,
+            limit=limit,
+            latest_comments=comments,
+            fields=load_fields
+        )
+
+        headers = {}
+        cursor_token = next_cursor(projects, limit)
+        if cursor_token:
+            headers["X-Next-Cursor"] = cursor_token
+        if load_fields is not selected:
+            for project in projects:
+                del project["created_at"]
+
+        tags = [LIST_TAG] + response_tags(projects)
+        # A lagging secondary can return a page from before a write whose
+        # invalidation already ran, so keep such pages only briefly
+        ttl = SECONDARY_READ_CACHE_TTL if list_reads_may_lag() else None
+        return await project_response_cache.store(cache_key, projects, tags, headers=headers, since=since, ttl=ttl)
+
+    entry = await project_flights.do(cache_key, load_page)
+    return entry.to_response(request)
 
 @router.get("/user", response_model=List[ProjectSchema])
 async def get_user_projects(
+    comments: int = inline_comments_query(),
     db = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get all projects created by the current user
     """
-    projects_cursor = db.projects.find({"user_id": current_user.id}).sort("created_at", -1)
-    
-    
-    projects = []
-    async for project in projects_cursor:
-        proj = Project(**project)
-        
-        likes_count = len(proj.likes) if proj.likes else 0
-        
-        formatted_comments = []
-        if proj.comments:
-            for comment in proj.comments:
-                user = await db.users.find_one({"id": comment.user_id})
-                if user:
-                    user_info = {
-                        "id": user["id"],
-                        "name": user["name"],
-                        "image": user.get("image", None)
-                    }
-                    formatted_comments.append({
-                        "id": comment.id,
-                        "text": comment.text,
-                        "created_at": comment.created_at,
-                        "user": user_info
-                    })
-        
-        project_data = proj.model_dump()
-        project_data["likes"] = likes_count
-        project_data["comments"] = formatted_comments
-        projects.append(project_data)
-    
-    return projects
+    projects = await fetch_projects(
+        db,
+        {"user_id": current_user.id},
+        sort={"created_at": -1},
+        latest_comments=comments
+    )
+    return FastJSONResponse(projects)
+
+@router.get("/trending", response_model=List[ProjectSchema])
+async def get_trending_projects(
+    limit: int = Query(10, ge=1, le=50),
+    db = Depends(get_read_db)
+):
+    """
+    Get the projects with the most recent likes and comments, ranked by a
+    time-decayed score
+    """
+    projects = await project_flights.do(
+        ("trending", limit),
+        fetch_projects,
+        db,
+        {"trending_score": {"$gt": 0}},
+        sort=TRENDING_SORT,
+        limit=limit
+    )
+    return FastJSONResponse(projects)
+
+@router.get("/search", response_model=ProjectSearchResponse)
+async def search_projects(
+    q: str = Query(..., min_length=1, description="Full-text query over title, description and tech stack"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    tech_stack: Optional[str] = Query(None, description="Filter by tech stack (comma separated)"),
+    min_budget: Optional[int] = Query(None, description="Filter by minimum budget"),
+    max_budget: Optional[int] = Query(None, description="Filter by maximum budget"),
+    status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
+    db = Depends(get_read_db)
+):
+    """
+    Search projects by relevance, with facet counts per tech and budget bucket
+    """
+    filter_query = build_project_filter(tech_stack, min_budget, max_budget, status)
+    search_key = ("search", q, skip, limit, tech_stack, min_budget, max_budget, status)
+    results = await project_flights.do(search_key, run_project_search, db, q, filter_query, skip, limit)
+    return FastJSONResponse(results)
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_projects(
+    request: Request,
+    db = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Import projects from an NDJSON body, one ProjectCreate object per line.
+    Valid rows are inserted even when others fail; failures are reported per
+    line. Past the row cap the response is a 413 that still reports what was
+    inserted.
+    """
+    try:
+        result = await import_projects(db, iter_ndjson_lines(request.stream()), current_user.id)
+    except TooManyRows as exc:
+        # Rows before the cap are already written: report them with the error
+        if exc.result["inserted"]:
+            await invalidate_project_lists()
+        return FastJSONResponse({"detail": str(exc), **exc.result}, status_code=413)
+
+    if result["inserted"]:
+        await invalidate_project_lists()
+    return result
+
+@router.get("/export")
+async def export_projects_ndjson(
+    tech_stack: Optional[str] = Query(None, description="Filter by tech stack (comma separated)"),
+    min_budget: Optional[int] = Query(None, description="Filter by minimum budget"),
+    max_budget: Optional[int] = Query(None, description="Filter by maximum budget"),
+    status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
+    db = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream projects as NDJSON, oldest first
+    """
+    filter_query = build_project_filter(tech_stack, min_budget, max_budget, status)
+    return StreamingResponse(
+        export_projects(db, filter_query),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'}
+    )
+
+@router.get("/changes", response_model=ProjectChanges)
+async def get_project_changes(
+    since: Optional[str] = Query(None, description="Token from the next field of the previous response; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=500),
+    db = Depends(get_db)
+):
+    """
+    Projects created or updated and ids of projects deleted since the token,
+    oldest first. Keep calling with ``next`` while ``has_more`` is true.
+    """
+    changes = await list_changes(db, since, limit)
+    return FastJSONResponse(changes)
+
+def event_stream_response(project_id: Optional[str] = None) -> StreamingResponse:
+    return StreamingResponse(
+        stream_events(project_events_broker, project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/events")
+async def stream_all_project_events():
+    """
+    Server-Sent Events with like count, comment and status changes of every
+    project
+    """
+    return event_stream_response()
 
 @router.post("", response_model=ProjectSchema)
 async def create_project(
@@ -140,53 +295,40 @@ async def create_project(
         images=project.images if project.images else []
     )
     
-    result = await db.projects.insert_one(new_project.model_dump())
-    
-    created_project = await db.projects.find_one({"_id": result.inserted_id})
-    proj = Project(**created_project)
-    project_data = proj.model_dump()
-    project_data["likes"] = 0
-    project_data["comments"] = []
+    await db.projects.insert_one(new_project.model_dump())
+    await invalidate_project(new_project.id, lists=True)
     
-    return project_data
+    return project_response(new_project.model_dump(), owner=user_summary(current_user))
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 async def get_project(
     project_id: str,
+    request: Request,
+    comments: int = inline_comments_query(),
+    fields: Optional[str] = fields_query(),
     db = Depends(get_db)
 ):
     """
     Get a specific project by ID
     """
-    project_doc = await db.projects.find_one({"id": project_id})
-    if project_doc is None:
+    selected = parse_fields(fields)
+    cache_key = ("project", project_id, comments, selected)
+    cached = await project_response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response(request)
+
+    async def load_project():
+        since = await project_response_cache.version()
+        project = await fetch_project(db, project_id, latest_comments=comments, fields=selected)
+        if project is None:
+            return None
+        return await project_response_cache.store(cache_key, project, response_tags([project]), since=since)
+
+    entry = await project_flights.do(cache_key, load_project)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    proj = Project(**project_doc)
-    
-    likes_count = len(proj.likes) if proj.likes else 0
-    formatted_comments = []
-    if proj.comments:
-        for comment in proj.comments:
-            user = await db.users.find_one({"id": comment.user_id})
-            if user:
-                user_info = {
-                    "id": user["id"],
-                    "name": user["name"],
-                    "image": user.get("image", None)
-                }
-                formatted_comments.append({
-                    "id": comment.id,
-                    "text": comment.text,
-                    "created_at": comment.created_at,
-                    "user": user_info
-                })
-    
-    project_data = proj.model_dump()
-    project_data["likes"] = likes_count
-    project_data["comments"] = formatted_comments
-    
-    return project_data
+    return entry.to_response(request)
 
 @router.patch("/{project_id}", response_model=ProjectSchema)
 async def update_project(
@@ -198,50 +340,25 @@ async def update_project(
     """
     Update a project
     """
-    existing_project = await db.projects.find_one({"id": project_id})
-    if existing_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if existing_project["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this project")
-    
+    owned_project = {"id": project_id, "user_id": current_user.id}
     update_data = {k: v for k, v in project_update.model_dump().items() if v is not None}
     
     if update_data:
-        result = await db.projects.update_one(
-            {"id": project_id},
-            {"$set": update_data}
+        updated_project = await db.projects.find_one_and_update(
+            owned_project,
+            {"$set": {**update_data, "updated_at": datetime.now()}},
+            projection=PROJECT_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        
-        if result.modified_count == 0:
-            raise HTTPException(status_code=400, detail="Project not updated")
-    
-    updated_project_doc = await db.projects.find_one({"id": project_id})
-    proj = Project(**updated_project_doc)
-    likes_count = len(proj.likes) if proj.likes else 0
-    
-    formatted_comments = []
-    if proj.comments:
-        for comment in proj.comments:
-            user = await db.users.find_one({"id": comment.user_id})
-            if user:
-                user_info = {
-                    "id": user["id"],
-                    "name": user["name"],
-                    "image": user.get("image", None)
-                }
-                formatted_comments.append({
-                    "id": comment.id,
-                    "text": comment.text,
-                    "created_at": comment.created_at,
-                    "user": user_info
-                })
+    else:
+        updated_project = await db.projects.find_one(owned_project, PROJECT_PROJECTION)
     
-    project_data = proj.model_dump()
-    project_data["likes"] = likes_count
-    project_data["comments"] = formatted_comments
+    if updated_project is None:
+        await raise_not_found_or_forbidden(db, project_id, "update")
     
-    return project_data
+    if update_data:
+        await invalidate_project(project_id, lists=bool(LIST_FIELDS & update_data.keys()))
+    return project_response(updated_project, owner=user_summary(current_user))
 
 @router.patch("/{project_id}/status", response_model=ProjectSchema)
 async def update_project_status(
@@ -253,45 +370,19 @@ async def update_project_status(
     """
     Mark a project as COMPLETED
     """
-    existing_project = await db.projects.find_one({"id": project_id})
-    if existing_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    result = await db.projects.update_one(
-        {"id": project_id},
-        {"$set": {"status": status_update.status}}
+    updated_project = await db.projects.find_one_and_update(
+        {"id": project_id, "user_id": current_user.id},
+        {"$set": {"status": status_update.status, "updated_at": datetime.now()}},
+        projection=PROJECT_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.modified_count == 0:
-        raise HTTPException(status_code=400, detail="Project status not updated")
-    
-    updated_project_doc = await db.projects.find_one({"id": project_id})
-    proj = Project(**updated_project_doc)
+    if updated_project is None:
+        await raise_not_found_or_forbidden(db, project_id, "update")
+    await invalidate_project(project_id, lists=True)
+    project_events_broker.publish_local(status_event(project_id, updated_project["status"]))
     
-    likes_count = len(proj.likes) if proj.likes else 0
-    
-    formatted_comments = []
-    if proj.comments:
-        for comment in proj.comments:
-            user = await db.users.find_one({"id": comment.user_id})
-            if user:
-                user_info = {
-                    "id": user["id"],
-                    "name": user["name"],
-                    "image": user.get("image", None)
-                }
-                formatted_comments.append({
-                    "id": comment.id,
-                    "text": comment.text,
-                    "created_at": comment.created_at,
-                    "user": user_info
-                })
-    
-    project_data = proj.model_dump()
-    project_data["likes"] = likes_count
-    project_data["comments"] = formatted_comments
-    
-    return project_data
+    return project_response(updated_project, owner=user_summary(current_user))
 
 @router.post("/{project_id}/like", response_model=ProjectLikeResponse)
 async def toggle_project_like(
@@ -302,39 +393,18 @@ async def toggle_project_like(
     """
     Toggle like status for a project
     """
-    existing_project = await db.projects.find_one({"id": project_id})
-    if existing_project is None:
+    try:
+        like_state = await toggle_like(db, project_id, current_user.id)
+    except FlushTimeout as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    if like_state is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    if not like_buffer.enabled:
+        # Buffered toggles invalidate when their batch is flushed
+        await invalidate_project(project_id)
+    project_events_broker.publish_local(likes_event(project_id, like_state["likes"]))
     
-    project = Project(**existing_project)
-    
-    user_id = current_user.id
-    liked = False
-    
-    if project.likes and user_id in project.likes:
-        result = await db.projects.update_one(
-            {"id": project_id},
-            {"$pull": {"likes": user_id}}
-        )
-        liked = False
-    else:
-        if not project.likes:
-            project.likes = []
-        
-        result = await db.projects.update_one(
-            {"id": project_id},
-            {"$addToSet": {"likes": user_id}}
-        )
-        liked = True
-    
-    updated_project = await db.projects.find_one({"id": project_id})
-    updated_likes = updated_project.get("likes", [])
-    likes_count = len(updated_likes)
-    
-    return {
-        "liked": liked,
-        "likes": likes_count
-    }
+    return like_state
 
 @router.get("/{project_id}/like", response_model=ProjectLikeResponse)
 async def check_project_like(
@@ -345,20 +415,48 @@ async def check_project_like(
     """
     Check if current user has liked a project
     """
-    existing_project = await db.projects.find_one({"id": project_id})
-    if existing_project is None:
+    like_state = await get_like_state(db, project_id, current_user.id)
+    if like_state is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project = Project(**existing_project)
+    return like_state
+
+@router.get("/{project_id}/events")
+async def stream_project_events(
+    project_id: str,
+    db = Depends(get_db)
+):
+    """
+    Server-Sent Events with like count, comment and status changes of one
+    project
+    """
+    existing_project = await db.projects.find_one({"id": project_id}, {"_id": 1})
+    if existing_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    user_id = current_user.id
-    liked = project.likes and user_id in project.likes
-    likes_count = len(project.likes) if project.likes else 0
+    return event_stream_response(project_id)
+
+@router.get("/{project_id}/comments", response_model=CommentPage)
+async def get_project_comments(
+    project_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db = Depends(get_db)
+):
+    """
+    Get the comments of a project, newest first
+    """
+    async def load_comments():
+        existing_project = await db.projects.find_one({"id": project_id}, {"_id": 1})
+        if existing_project is None:
+            return None
+        return await list_comments_page(db, project_id, cursor, limit)
+
+    page = await project_flights.do(("comments", project_id, cursor, limit), load_comments)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    return {
-        "liked": liked,
-        "likes": likes_count
-    }
+    return page
 
 @router.post("/{project_id}/comments", response_model=CommentResponse)
 async def add_comment(
@@ -375,17 +473,23 @@ async def add_comment(
         raise HTTPException(status_code=404, detail="Project not found")
     
     new_comment = Comment(
+        project_id=project_id,
         user_id=current_user.id,
         text=comment_data.text
     )
 
+    await db.comments.insert_one(new_comment.model_dump())
     result = await db.projects.update_one(
         {"id": project_id},
-        {"$push": {"comments": new_comment.model_dump()}}
+        {
+            "$inc": {"comment_count": 1, "trending_score": comment_score(new_comment.created_at)},
+            "$set": {"updated_at": new_comment.created_at}
+        }
     )
     
     if result.modified_count == 0:
         raise HTTPException(status_code=400, detail="Failed to add comment")
+    await invalidate_project(project_id)
     
     user_info = {
         "id": current_user.id,
@@ -393,12 +497,15 @@ async def add_comment(
         "image": current_user.image
     }
     
-    return {
+    comment = {
         "id": new_comment.id,
         "text": new_comment.text,
         "created_at": new_comment.created_at,
         "user": user_info
     }
+    project_events_broker.publish_local(comment_event(project_id, comment))
+    
+    return comment
 
 @router.delete("/{project_id}", status_code=204)
 async def delete_project(
@@ -409,16 +516,16 @@ async def delete_project(
     """
     Delete a project
     """
-    existing_project = await db.projects.find_one({"id": project_id})
-    if existing_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if existing_project["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this project")
-    
-    result = await db.projects.delete_one({"id": project_id})
+    result = await db.projects.delete_one({"id": project_id, "user_id": current_user.id})
     
     if result.deleted_count == 0:
-        raise HTTPException(status_code=400, detail="Project not deleted")
+        await raise_not_found_or_forbidden(db, project_id, "delete")
+    await db.project_tombstones.insert_one(
+        ProjectTombstone(id=project_id, user_id=current_user.id).model_dump()
+    )
+    await invalidate_project(project_id, lists=True)
+    
+    await db.comments.delete_many({"project_id": project_id})
+    await db.project_likes.delete_many({"project_id": project_id})
     
     return None 
\ No newline at end of file
@@ -35,14 +35,57 @@ class Project(ProjectBase):
     id: str
     status: ProjectStatus
     created_at: datetime
+    updated_at: Optional[datetime] = None
     user_id: str
     images: Optional[List[str]] = None
     likes: int = 0  
+    comment_count: int = 0
+    owner: Optional[dict] = None
     comments: Optional[List[CommentResponse]] = None
 
     class Config:
         populate_by_name = True
 
+class ProjectSearchResult(Project):
+    score: float
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class BudgetBucket(BaseModel):
+    min: int
+    max: Optional[int] = None
+    count: int
+
+class ProjectSearchFacets(BaseModel):
+    tech_stack: List[FacetCount]
+    budget: List[BudgetBucket]
+    status: List[FacetCount]
+
+class ProjectSearchResponse(BaseModel):
+    total: int
+    results: List[ProjectSearchResult]
+    facets: ProjectSearchFacets
+
+class ProjectChanges(BaseModel):
+    changed: List[Project]
+    deleted: List[str]
+    next: str
+    has_more: bool
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    errors: List[BulkImportError]
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
+
 class ProjectLikeResponse(BaseModel):
     liked: bool
     likes: int 
\ No newline at end of file
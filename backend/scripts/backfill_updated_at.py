@@ -0,0 +1,40 @@
+"""
+One-shot migration giving projects written before ``updated_at`` existed an
+``updated_at`` equal to their ``created_at``, so the change feed
+(``GET /api/projects/changes``) can see them.
+
+Safe to re-run: only projects without the field are touched.
+
+Run from the backend directory:
+
+    python -m scripts.backfill_updated_at
+"""
+import asyncio
+import logging
+
+from db.database import connect, close
+from db.indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(db):
+    await ensure_indexes(db)
+    result = await db.projects.update_many(
+        {"updated_at": {"$exists": False}},
+        [{"$set": {"updated_at": "$created_at"}}]
+    )
+    logger.info("Backfilled updated_at on %d projects", result.modified_count)
+
+
+async def main():
+    db = connect()
+    try:
+        await migrate(db)
+    finally:
+        close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
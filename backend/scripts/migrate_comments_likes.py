@@ -0,0 +1,87 @@
+"""
+One-shot migration moving the embedded ``likes`` and ``comments`` arrays out
+of project documents into the ``project_likes`` and ``comments`` collections,
+and filling the ``likes_count`` / ``comment_count`` counters.
+
+Safe to re-run: rows that were already copied are skipped through the unique
+indexes, and projects that have been migrated no longer carry the arrays.
+
+Run from the backend directory:
+
+    python -m scripts.migrate_comments_likes
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db.database import connect, close
+from db.indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+async def _write_ignoring_duplicates(collection, operations):
+    if not operations:
+        return
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        errors = [e for e in exc.details.get("writeErrors", []) if e.get("code") != DUPLICATE_KEY]
+        if errors:
+            raise
+
+
+async def migrate(db):
+    await ensure_indexes(db)
+
+    query = {"$or": [{"likes": {"$exists": True}}, {"comments": {"$exists": True}}]}
+    migrated = 0
+    async for project in db.projects.find(query, {"id": 1, "created_at": 1, "likes": 1, "comments": 1}):
+        project_id = project["id"]
+        liked_at = project.get("created_at") or datetime.now()
+
+        like_ops = [
+            UpdateOne(
+                {"project_id": project_id, "user_id": user_id},
+                {"$setOnInsert": {"project_id": project_id, "user_id": user_id, "created_at": liked_at}},
+                upsert=True
+            )
+            for user_id in set(project.get("likes") or [])
+        ]
+        comment_ops = [
+            InsertOne({**comment, "project_id": project_id})
+            for comment in project.get("comments") or []
+        ]
+        await _write_ignoring_duplicates(db.project_likes, like_ops)
+        await _write_ignoring_duplicates(db.comments, comment_ops)
+
+        likes_count = await db.project_likes.count_documents({"project_id": project_id})
+        comment_count = await db.comments.count_documents({"project_id": project_id})
+        await db.projects.update_one(
+            {"id": project_id},
+            {
+                "$set": {"likes_count": likes_count, "comment_count": comment_count},
+                "$unset": {"likes": "", "comments": ""}
+            }
+        )
+        migrated += 1
+
+    logger.info("Migrated %d projects", migrated)
+
+
+async def main():
+    db = connect()
+    try:
+        await migrate(db)
+    finally:
+        close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -1,4 +1,8 @@
 import os
+import time
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -10,37 +14,128 @@ from dotenv import load_dotenv
 from db.database import get_db
 from schemas.user import TokenData
 from models.user import User
+from services.cache import TTLCache, cache_backend
+from services.singleflight import SingleFlight
+
+try:
+    import jwt as pyjwt
+    if not hasattr(pyjwt, "PyJWTError"):
+        pyjwt = None
+except ImportError:  # pragma: no cover - PyJWT is an optional faster decoder
+    pyjwt = None
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("JWT_SECRET", "your_super_secret_key_change_in_production")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRATION", "600"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "32"))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+# auto uses PyJWT when it is installed and falls back to python-jose
+JWT_BACKEND = os.getenv("JWT_BACKEND", "auto")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
+def _evict_user_pair(key, user: User):
+    # A user is cached under its id and its email; both entries leave
+    # together so an invalidation found through the id also drops the email
+    user_cache.delete(("email", user.email), ("id", user.id))
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL, on_evict=_evict_user_pair)
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+# Concurrent cache misses for the same user share one find_one
+user_flights = SingleFlight("users")
+use_pyjwt = pyjwt is not None and JWT_BACKEND in ("auto", "pyjwt")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
-async def get_user(db, email: str):
-    user_data = await db.users.find_one({"email": email})
+def create_password_executor(kind: str = PASSWORD_HASH_EXECUTOR, workers: int = PASSWORD_HASH_WORKERS):
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+password_executor = create_password_executor()
+password_semaphore = asyncio.Semaphore(PASSWORD_HASH_CONCURRENCY)
+
+async def run_password_task(func, *args):
+    """
+    Run a bcrypt call on the password executor so it never blocks the event
+    loop. At most PASSWORD_HASH_CONCURRENCY calls are queued or running at
+    once; callers that cannot get a slot in time get a 503 instead of piling
+    up behind a login storm.
+    """
+    try:
+        await asyncio.wait_for(password_semaphore.acquire(), timeout=PASSWORD_HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests"
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        password_semaphore.release()
+
+async def verify_password_async(plain_password, hashed_password):
+    return await run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await run_password_task(get_password_hash, password)
+
+def cache_user(user: User):
+    user_cache.set(("email", user.email), user)
+    user_cache.set(("id", user.id), user)
+
+def invalidate_user(user: User):
+    user_cache.delete(("email", user.email), ("id", user.id))
+
+def _drop_invalidated_users(tags):
+    for tag in tags:
+        if not tag.startswith("user:"):
+            continue
+        user_id = tag[len("user:"):]
+        cached = user_cache.peek(("id", user_id))
+        if cached is not None:
+            invalidate_user(cached)
+
+# Profile changes made in other workers arrive as user:<id> invalidations
+cache_backend.add_listener(_drop_invalidated_users)
+
+async def _load_user(db, field: str, value: str):
+    user_data = await db.users.find_one({field: value})
     if user_data:
-        return User(**user_data)
+        user = User(**user_data)
+        cache_user(user)
+        return user
     return None
 
+async def get_user(db, email: str):
+    user = user_cache.get(("email", email))
+    if user is not None:
+        return user
+    return await user_flights.do(("email", email), _load_user, db, "email", email)
+
 async def get_user_by_id(db, user_id: str):
-    user_data = await db.users.find_one({"id": user_id})
-    if user_data:
-        return User(**user_data)
-    return None
+    user = user_cache.get(("id", user_id))
+    if user is not None:
+        return user
+    return await user_flights.do(("id", user_id), _load_user, db, "id", user_id)
 
 async def authenticate_user(db, email: str, password: str):
     user = await get_user(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
@@ -54,6 +149,31 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _decode_jwt(token: str) -> dict:
+    if use_pyjwt:
+        try:
+            return pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except pyjwt.PyJWTError as exc:
+            raise JWTError(str(exc))
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a token and return its claims. Verified claims are cached by token
+    digest for at most the token's remaining lifetime, so a session's token is
+    only checked cryptographically once per TOKEN_CACHE_TTL.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None and claims.get("exp", 0) > time.time():
+        return claims
+
+    claims = _decode_jwt(token)
+    expires_at = claims.get("exp")
+    if expires_at is not None:
+        token_cache.set(digest, claims, ttl=float(expires_at) - time.time())
+    return claims
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,7 +181,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
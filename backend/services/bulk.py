@@ -0,0 +1,150 @@
+import json
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from models.project import Project, ProjectStatus
+from schemas.project import ProjectCreate
+from services.projects import PROJECT_PROJECTION, project_response
+from services.serialization import dumps
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "50000"))
+BULK_MAX_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", "65536"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+
+class TooManyRows(Exception):
+    """
+    Raised once the row cap is hit; result holds what was imported up to it
+    """
+
+    def __init__(self, message: str, result: dict):
+        super().__init__(message)
+        self.result = result
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = BULK_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a streamed request body into (line number, line) pairs without
+    buffering more than one partial line. A line longer than max_line_bytes
+    is yielded as None and the rest of it is skipped.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if oversized:
+                # Tail of a line already reported as too long
+                oversized = False
+            elif len(line) > max_line_bytes:
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+        if len(buffer) > max_line_bytes:
+            if not oversized:
+                oversized = True
+                yield line_number + 1, None
+            buffer = b""
+    if buffer.strip() and not oversized:
+        yield line_number + 1, buffer
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _insert_chunk(db, rows: List[Tuple[int, dict]], errors: List[dict]) -> int:
+    if not rows:
+        return 0
+    try:
+        result = await db.projects.insert_many([doc for _, doc in rows], ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as exc:
+        for write_error in exc.details.get("writeErrors", []):
+            errors.append({
+                "line": rows[write_error["index"]][0],
+                "error": write_error.get("errmsg", "Write failed")
+            })
+        return exc.details.get("nInserted", 0)
+
+
+async def import_projects(db, lines: AsyncIterator[Tuple[int, Optional[bytes]]], user_id: str) -> dict:
+    """
+    Validate NDJSON rows against ProjectCreate in chunks and write each chunk
+    with one unordered insert_many, collecting per-row errors. Past
+    BULK_MAX_ROWS the rows read so far are still written and TooManyRows
+    carries that partial result.
+    """
+    inserted = 0
+    errors: List[dict] = []
+    chunk: List[Tuple[int, dict]] = []
+    rows = 0
+
+    async for line_number, line in lines:
+        rows += 1
+        if rows > BULK_MAX_ROWS:
+            inserted += await _insert_chunk(db, chunk, errors)
+            errors.sort(key=lambda error: error["line"])
+            raise TooManyRows(
+                f"At most {BULK_MAX_ROWS} rows can be imported at once; "
+                f"rows from line {line_number} on were not read",
+                {"inserted": inserted, "errors": errors}
+            )
+        if line is None:
+            errors.append({"line": line_number, "error": f"Line longer than {BULK_MAX_LINE_BYTES} bytes"})
+            continue
+        try:
+            project = ProjectCreate.model_validate(json.loads(line))
+        except ValidationError as exc:
+            errors.append({"line": line_number, "error": _validation_message(exc)})
+            continue
+        except json.JSONDecodeError as exc:
+            errors.append({"line": line_number, "error": f"Invalid JSON: {exc.msg}"})
+            continue
+        except ValueError:
+            # json.loads raises UnicodeDecodeError on bytes that are not UTF-8
+            errors.append({"line": line_number, "error": "Invalid JSON: line is not valid UTF-8"})
+            continue
+
+        new_project = Project(
+            title=project.title,
+            description=project.description,
+            budget=project.budget,
+            tech_stack=project.tech_stack,
+            status=ProjectStatus.OPEN,
+            user_id=user_id,
+            images=project.images if project.images else []
+        )
+        chunk.append((line_number, new_project.model_dump()))
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            inserted += await _insert_chunk(db, chunk, errors)
+            chunk = []
+
+    inserted += await _insert_chunk(db, chunk, errors)
+    errors.sort(key=lambda error: error["line"])
+    return {"inserted": inserted, "errors": errors}
+
+
+async def export_projects(db, filter_query: dict) -> AsyncIterator[bytes]:
+    """
+    Stream matching projects as NDJSON straight from a Mongo cursor, one
+    batch in memory at a time
+    """
+    cursor = db.projects.find(filter_query, PROJECT_PROJECTION).sort(
+        [("created_at", 1), ("id", 1)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+    async for doc in cursor:
+        yield dumps(project_response(doc)) + b"\n"
@@ -0,0 +1,438 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError, WatchError
+except ImportError:  # pragma: no cover - redis is only needed for CACHE_URL=redis://
+    aioredis = None
+    RedisError = WatchError = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "flancer")
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "4096"))
+CACHE_RETRY_SECONDS = float(os.getenv("CACHE_RETRY_SECONDS", "5"))
+# How long an invalidation is remembered for stores of loads that started
+# before it; loads slower than this can still store a stale entry
+CACHE_INVALIDATION_WINDOW = float(os.getenv("CACHE_INVALIDATION_WINDOW", "60"))
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries also expire after a TTL.
+
+    Meant for the single event loop of one worker, so it takes no locks.
+    on_evict is called with the key and value of every entry the cache drops
+    on its own, expired or over maxsize.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def _evicted(self, key: Hashable, value: Any) -> None:
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._evicted(key, value)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry without touching recency or the counters"""
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return default
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted, (value, _) = self._data.popitem(last=False)
+            self._evicted(evicted, value)
+
+    def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+TagListener = Callable[[List[str]], None]
+
+
+class CacheBackend(ABC):
+    """
+    Byte-valued cache shared by the API, with tag based invalidation.
+
+    Every invalidation is also delivered to the tag listeners registered in
+    each worker, so process-local caches (users, tokens) can drop their copies.
+
+    Invalidations advance a version. A caller that reads version() before
+    loading and passes it to set() as since gets its entry dropped when one
+    of its tags was invalidated meanwhile, so a load that raced a write
+    cannot store the pre-write data after the write's invalidation.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._listeners: List[TagListener] = []
+
+    def add_listener(self, listener: TagListener) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, tags: List[str]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(tags)
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def version(self) -> int:
+        ...
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = (),
+        since: Optional[int] = None
+    ) -> bool:
+        """
+        Store the entry unless one of its tags was invalidated after version
+        since; returns whether it was stored
+        """
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Single-process stand-in: an LRU/TTL cache plus an in-memory tag index.
+    Invalidations only reach listeners in this process.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = 3600.0):
+        super().__init__()
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=lambda key, _: self._forget(key))
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
+        self._key_tags: Dict[str, Set[str]] = {}
+        self._version = 0
+        # tag -> (version, monotonic time) of its last invalidation, oldest first
+        self._invalidated: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def version(self) -> int:
+        return self._version
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = (),
+        since: Optional[int] = None
+    ) -> bool:
+        tags = list(tags)
+        if since is not None and any(
+            self._invalidated.get(tag, (0,))[0] > since for tag in tags
+        ):
+            return False
+        self._forget(key)
+        self.entries.set(key, value, ttl=ttl)
+        if key in self.entries and tags:
+            self._key_tags[key] = set(tags)
+            for tag in tags:
+                self._tags[tag].add(key)
+        return True
+
+    def _forget(self, key: str) -> None:
+        """
+        Drop a key from the tag index once its entry is gone
+        """
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        self._version += 1
+        now = time.monotonic()
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self.entries.delete(key)
+                self._forget(key)
+            self._invalidated[tag] = (self._version, now)
+            self._invalidated.move_to_end(tag)
+        while self._invalidated:
+            _, (_, invalidated_at) = next(iter(self._invalidated.items()))
+            if invalidated_at > now - CACHE_INVALIDATION_WINDOW:
+                break
+            self._invalidated.popitem(last=False)
+        self._notify(list(tags))
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self.entries), "maxsize": self.entries.maxsize}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker through a Redis-protocol server. Tags are
+    Redis sets of keys; invalidations delete the tagged keys and are published
+    on a channel that every worker subscribes to.
+
+    Any client exposing the redis.asyncio API works, including fakeredis for
+    local runs.
+    """
+
+    def __init__(self, client, prefix: str = CACHE_PREFIX):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+        self.origin = uuid.uuid4().hex
+        self.errors = 0
+        self._listener_task: Optional[asyncio.Task] = None
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _invalidated_key(self, tag: str) -> str:
+        return f"{self.prefix}:invalidated:{tag}"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.prefix}:version"
+
+    async def start(self) -> None:
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        await self.client.aclose()
+
+    async def _listen(self) -> None:
+        """
+        Relay invalidations published by other workers to local listeners,
+        resubscribing whenever the connection drops. Invalidations published
+        while disconnected are missed, so process-local copies can be stale
+        for up to their own TTL.
+        """
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                logger.info("Listening for cache invalidations on %s", self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self.origin:
+                        self._notify(payload.get("tags", []))
+                logger.warning("Cache invalidation subscription ended; resubscribing")
+            except (RedisError, OSError) as exc:
+                logger.warning("Cache invalidation subscription failed (%s); resubscribing", exc)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+            await asyncio.sleep(CACHE_RETRY_SECONDS)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.client.get(self._key(key))
+        except (RedisError, OSError) as exc:
+            # Fail open: an unreachable cache is a miss, not an error
+            self.errors += 1
+            logger.warning("Cache read failed (%s); treating as a miss", exc)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def version(self) -> int:
+        try:
+            return int(await self.client.get(self._version_key) or 0)
+        except (RedisError, OSError) as exc:
+            # 0 makes a later store skip any tag invalidated in the window
+            self.errors += 1
+            logger.warning("Reading the cache invalidation version failed (%s)", exc)
+            return 0
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = (),
+        since: Optional[int] = None
+    ) -> bool:
+        tags = list(tags)
+        ttl_ms = max(1, int(ttl * 1000))
+        watched = [self._invalidated_key(tag) for tag in tags] if since is not None else []
+        try:
+            async with self.client.pipeline(transaction=bool(watched)) as pipe:
+                if watched:
+                    # An invalidation landing before EXEC aborts the store
+                    await pipe.watch(*watched)
+                    versions = await pipe.mget(*watched)
+                    if any(int(version) > since for version in versions if version is not None):
+                        return False
+                    pipe.multi()
+                pipe.set(self._key(key), value, px=ttl_ms)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), self._key(key))
+                    pipe.pexpire(self._tag_key(tag), ttl_ms)
+                await pipe.execute()
+        except WatchError:
+            return False
+        except (RedisError, OSError) as exc:
+            self.errors += 1
+            logger.warning("Cache write failed (%s); skipping the store", exc)
+            return False
+        return True
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Best effort: the write that triggered the invalidation has already
+        committed, so a Redis failure is logged and entries it could not drop
+        expire with their TTL
+        """
+        if not tags:
+            return
+        try:
+            # Record the invalidation before reading the tag sets, so a store
+            # either lands in a set deleted below or sees the newer version
+            version = await self.client.incr(self._version_key)
+            window_ms = int(CACHE_INVALIDATION_WINDOW * 1000)
+            async with self.client.pipeline(transaction=True) as pipe:
+                for tag in tags:
+                    pipe.set(self._invalidated_key(tag), version, px=window_ms)
+                await pipe.execute()
+            for tag in tags:
+                keys = await self.client.smembers(self._tag_key(tag))
+                await self.client.delete(self._tag_key(tag), *keys)
+        except (RedisError, OSError) as exc:
+            self.errors += 1
+            logger.error("Cache invalidation of %s failed (%s)", ", ".join(tags), exc)
+        self._notify(list(tags))
+        try:
+            await self.client.publish(self.channel, json.dumps({"origin": self.origin, "tags": list(tags)}))
+        except (RedisError, OSError) as exc:
+            self.errors += 1
+            logger.error("Publishing cache invalidation of %s failed (%s)", ", ".join(tags), exc)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "errors": self.errors}
+
+def create_cache_backend(url: str = CACHE_URL) -> CacheBackend:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        if aioredis is None:
+            raise RuntimeError("CACHE_URL points at Redis but the redis package is not installed")
+        return RedisCacheBackend(aioredis.from_url(url))
+    return MemoryCacheBackend()
+
+
+cache_backend = create_cache_backend()
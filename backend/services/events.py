@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from models.project import Comment
+from services.projects import hydrate_comments
+from services.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_RETRY_SECONDS = float(os.getenv("EVENTS_RETRY_SECONDS", "5"))
+# auto: use change streams when the deployment supports them; local: only
+# publish from this worker's own writes
+EVENTS_SOURCE = os.getenv("EVENTS_SOURCE", "auto")
+
+# Project fields whose changes are streamed to clients; new comments are
+# watched on the comments collection instead of through comment_count
+WATCHED_FIELDS = ("likes_count", "status")
+
+# Sentinel telling a subscriber it fell too far behind and was dropped
+OVERFLOW = object()
+
+
+class Subscription:
+    def __init__(self, project_id: Optional[str], maxsize: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, event: dict) -> bool:
+        """
+        Queue an event without blocking; a full queue means the client is
+        not keeping up, so its backlog is discarded and it is disconnected
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+            return False
+
+
+class EventBroker:
+    """
+    Fans project events out to the SSE clients of this worker. Events come
+    from one shared change-stream watcher, or, when change streams are not
+    available, from the write handlers of this worker via publish_local().
+    """
+
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._by_project: Dict[str, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.watching = False
+        self.dropped = 0
+
+    def subscribe(self, project_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        if project_id is None:
+            self._all.add(subscription)
+        else:
+            self._by_project.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription.project_id is None:
+            self._all.discard(subscription)
+            return
+        subscribers = self._by_project.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._by_project[subscription.project_id]
+
+    def publish(self, event: dict) -> None:
+        targets = list(self._all) + list(self._by_project.get(event["project_id"], ()))
+        for subscription in targets:
+            if not subscription.offer(event):
+                self.dropped += 1
+                self.unsubscribe(subscription)
+                logger.info("Dropped slow event subscriber for %s", subscription.project_id or "all projects")
+
+    def publish_local(self, event: dict) -> None:
+        """
+        Publish from a write handler; a no-op while the change stream is
+        delivering the same change
+        """
+        if not self.watching:
+            self.publish(event)
+
+    def stats(self) -> dict:
+        return {
+            "source": "change_stream" if self.watching else "local",
+            "subscribers": len(self._all) + sum(len(subs) for subs in self._by_project.values()),
+            "dropped": self.dropped,
+        }
+
+    async def start(self, db) -> None:
+        if EVENTS_SOURCE == "local":
+            return
+        self._task = asyncio.create_task(self._watch(db))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.watching = False
+
+    async def _watch(self, db) -> None:
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": "comments", "operationType": "insert"},
+            {
+                "ns.coll": "projects",
+                "operationType": "update",
+                "$or": [
+                    {f"updateDescription.updatedFields.{field}": {"$exists": True}}
+                    for field in WATCHED_FIELDS
+                ]
+            },
+        ]}}]
+        resume_token = None
+        while True:
+            try:
+                async with db.watch(
+                    pipeline,
+                    full_document="updateLookup",
+                    resume_after=resume_token
+                ) as stream:
+                    self.watching = True
+                    logger.info("Streaming project events from the MongoDB change stream")
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        await self._dispatch(db, change)
+            except OperationFailure as exc:
+                self.watching = False
+                if resume_token is None:
+                    # Standalone servers have no change streams at all
+                    logger.warning("Change streams unavailable (%s); publishing events locally", exc)
+                    return
+                logger.warning("Change stream failed (%s); restarting", exc)
+                resume_token = None
+            except PyMongoError as exc:
+                self.watching = False
+                logger.warning("Change stream interrupted (%s); retrying", exc)
+            await asyncio.sleep(EVENTS_RETRY_SECONDS)
+
+    async def _dispatch(self, db, change: dict) -> None:
+        document = change.get("fullDocument")
+        if not document:
+            return
+        if change["ns"]["coll"] == "comments":
+            comments = await hydrate_comments(db, [Comment(**document)])
+            if comments:
+                self.publish(comment_event(document["project_id"], comments[0]))
+            return
+        updated = change.get("updateDescription", {}).get("updatedFields", {})
+        for event in project_update_events(document, updated):
+            self.publish(event)
+
+
+def likes_event(project_id: str, likes: int) -> dict:
+    return {"type": "likes", "project_id": project_id, "likes": likes}
+
+
+def comment_event(project_id: str, comment: dict) -> dict:
+    return {"type": "comment", "project_id": project_id, "comment": comment}
+
+
+def status_event(project_id: str, status: str) -> dict:
+    return {"type": "status", "project_id": project_id, "status": status}
+
+
+def project_update_events(document: dict, updated_fields: dict):
+    project_id = document["id"]
+    if "likes_count" in updated_fields:
+        yield likes_event(project_id, document.get("likes_count", 0))
+    if "status" in updated_fields:
+        yield status_event(project_id, document["status"])
+
+
+def format_sse(event: dict) -> bytes:
+    return b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+
+async def stream_events(broker: EventBroker, project_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    SSE body for one client. The subscription is released when the client
+    disconnects (the response cancels this generator) or falls behind.
+    """
+    subscription = broker.subscribe(project_id)
+    try:
+        yield f"retry: {int(EVENTS_RETRY_SECONDS * 1000)}\n\n".encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event is OVERFLOW:
+                yield b"event: overflow\ndata: {}\n\n"
+                return
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+project_events_broker = EventBroker()
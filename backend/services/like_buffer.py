@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from models.project import ProjectLike
+from services.metrics import (
+    like_flush_duration,
+    like_flush_failures,
+    like_flush_ops,
+    like_toggles_buffered,
+    like_toggles_coalesced
+)
+from services.response_cache import invalidate_project
+from services.trending import like_score
+
+logger = logging.getLogger(__name__)
+
+# direct: every toggle is written immediately; buffered: toggles are
+# coalesced in memory and written in batches
+LIKE_WRITE_MODE = os.getenv("LIKE_WRITE_MODE", "direct")
+LIKE_FLUSH_INTERVAL_MS = int(os.getenv("LIKE_FLUSH_INTERVAL_MS", "200"))
+LIKE_FLUSH_MAX_OPS = int(os.getenv("LIKE_FLUSH_MAX_OPS", "500"))
+# buffered: acknowledge once the toggle is in memory (lost if the worker
+# dies before the next flush); flushed: acknowledge after the batch holding
+# the toggle is written, which still coalesces concurrent clicks
+LIKE_DURABILITY = os.getenv("LIKE_DURABILITY", "buffered")
+# flushed: how long a toggle waits for its batch before giving up
+LIKE_FLUSH_TIMEOUT_MS = int(os.getenv("LIKE_FLUSH_TIMEOUT_MS", "5000"))
+
+LikeKey = Tuple[str, str]
+
+
+class FlushTimeout(Exception):
+    """
+    The toggle is buffered but its batch was not written within
+    LIKE_FLUSH_TIMEOUT_MS
+    """
+
+
+class PendingLike:
+    __slots__ = ("liked", "was_liked", "liked_at", "created_at")
+
+    def __init__(self, was_liked: bool, liked_at: Optional[datetime]):
+        self.was_liked = was_liked
+        self.liked_at = liked_at
+        self.liked = was_liked
+        self.created_at: Optional[datetime] = None
+
+    @property
+    def delta(self) -> int:
+        return int(self.liked) - int(self.was_liked)
+
+
+class LikeBuffer:
+    """
+    Write-behind buffer for like toggles. Only the final state of each
+    (project, user) pair is kept, so repeated clicks cancel out in memory, and
+    every flush writes the surviving toggles with one unordered bulk_write on
+    project_likes plus one $inc per project instead of one per click.
+
+    Reads of this worker see pending toggles through state() and
+    pending_delta(), so a user's own like shows up immediately.
+
+    The project_likes write and the counter write are separate: when only the
+    counter write fails, the computed deltas are kept and retried on their
+    own, since replaying the like upserts would find them already applied.
+    """
+
+    def __init__(
+        self,
+        interval_ms: int = LIKE_FLUSH_INTERVAL_MS,
+        max_ops: int = LIKE_FLUSH_MAX_OPS,
+        durability: str = LIKE_DURABILITY,
+        flush_timeout_ms: int = LIKE_FLUSH_TIMEOUT_MS
+    ):
+        self.interval = interval_ms / 1000
+        self.max_ops = max_ops
+        self.durability = durability
+        self.flush_timeout = flush_timeout_ms / 1000
+        self._pending: Dict[LikeKey, PendingLike] = {}
+        self._flushing: Dict[LikeKey, PendingLike] = {}
+        # Counter changes of written likes not yet applied to projects
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._recounts: Set[str] = set()
+        self._waiters: List[asyncio.Future] = []
+        self._generation = 0
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    async def start(self, db) -> None:
+        self._db = db
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the flush loop and write whatever is still buffered
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await self.flush()
+
+    def _entry(self, key: LikeKey) -> Optional[PendingLike]:
+        return self._pending.get(key) or self._flushing.get(key)
+
+    async def _load(self, db, key: LikeKey) -> PendingLike:
+        """
+        Pending entry for a pair, reading its persisted state when this
+        worker has no unflushed toggle for it
+        """
+        while True:
+            entry = self._pending.get(key)
+            if entry is not None:
+                return entry
+            in_flight = self._flushing.get(key)
+            if in_flight is not None:
+                # The batch being written decides the persisted state
+                entry = PendingLike(in_flight.liked, in_flight.created_at if in_flight.liked else None)
+                self._pending[key] = entry
+                return entry
+
+            generation = self._generation
+            doc = await db.project_likes.find_one(
+                {"project_id": key[0], "user_id": key[1]},
+                {"_id": 0, "created_at": 1}
+            )
+            if key in self._pending or key in self._flushing or generation != self._generation:
+                # Another toggle or a flush touched the pair while we read
+                continue
+            entry = PendingLike(doc is not None, doc.get("created_at") if doc else None)
+            self._pending[key] = entry
+            return entry
+
+    def state(self, project_id: str, user_id: str) -> Optional[bool]:
+        entry = self._entry((project_id, user_id))
+        return entry.liked if entry is not None else None
+
+    def pending_delta(self, project_id: str) -> int:
+        unapplied = self._counters.get(project_id, (0, 0.0))[0]
+        return unapplied + sum(
+            entry.delta
+            for entries in (self._flushing, self._pending)
+            for (pending_project, _), entry in entries.items()
+            if pending_project == project_id
+        )
+
+    async def toggle(self, db, project_id: str, user_id: str) -> bool:
+        """
+        Flip the buffered like state of a user and return the new state. With
+        flushed durability, raises FlushTimeout when the batch holding the
+        toggle is not written in time; the toggle stays buffered.
+        """
+        key = (project_id, user_id)
+        entry = await self._load(db, key)
+        entry.liked = not entry.liked
+        entry.created_at = datetime.now() if entry.liked else None
+        like_toggles_buffered.inc()
+        if entry.delta == 0 and key in self._pending:
+            # Clicked back to the persisted state: nothing to write
+            del self._pending[key]
+            like_toggles_coalesced.inc(amount=2)
+
+        if len(self._pending) >= self.max_ops:
+            self._wakeup.set()
+        if self.durability == "flushed":
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), self.flush_timeout)
+            except asyncio.TimeoutError:
+                raise FlushTimeout(
+                    f"Like not saved within {self.flush_timeout:g}s; it stays queued and will be retried"
+                )
+        return entry.liked
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Keep the loop alive: a dead task would buffer toggles forever
+                like_flush_failures.inc()
+                logger.exception("Flushing buffered likes failed unexpectedly")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            started = time.perf_counter()
+            if batch:
+                self._flushing = batch
+                try:
+                    counts, scores, recount = await self._write_likes(batch)
+                except PyMongoError:
+                    like_flush_failures.inc()
+                    logger.exception("Flushing %d buffered likes failed; retrying with the next flush", len(batch))
+                    self._requeue(batch)
+                    self._waiters = waiters + self._waiters
+                    return
+                finally:
+                    self._flushing = {}
+                    self._generation += 1
+                self._add_counters(counts, scores, recount)
+
+            try:
+                await self._write_counters()
+            except PyMongoError:
+                like_flush_failures.inc()
+                logger.exception(
+                    "Updating like counters of %d projects failed; retrying with the next flush",
+                    len(self._counters) + len(self._recounts)
+                )
+                self._waiters = waiters + self._waiters
+                return
+            if batch:
+                like_flush_duration.observe(time.perf_counter() - started)
+                like_flush_ops.observe(len(batch))
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _requeue(self, batch: Dict[LikeKey, PendingLike]) -> None:
+        for key, entry in batch.items():
+            newer = self._pending.get(key)
+            if newer is None:
+                self._pending[key] = entry
+                continue
+            # The newer toggle assumed this batch had been written
+            newer.was_liked = entry.was_liked
+            newer.liked_at = entry.liked_at
+            if newer.delta == 0:
+                del self._pending[key]
+
+    async def _write_likes(
+        self,
+        batch: Dict[LikeKey, PendingLike]
+    ) -> Tuple[Dict[str, int], Dict[str, float], Set[str]]:
+        """
+        Write the batch to project_likes and return the counter changes it
+        made: like counts and trending scores per project, and the projects
+        whose count has to be recounted
+        """
+        keys = list(batch)
+        operations = []
+        for project_id, user_id in keys:
+            entry = batch[(project_id, user_id)]
+            like_key = {"project_id": project_id, "user_id": user_id}
+            if entry.liked:
+                like = ProjectLike(project_id=project_id, user_id=user_id, created_at=entry.created_at)
+                operations.append(UpdateOne(like_key, {"$setOnInsert": like.model_dump()}, upsert=True))
+            else:
+                operations.append(DeleteOne(like_key))
+
+        result = await self._db.project_likes.bulk_write(operations, ordered=False)
+
+        # Count exactly what changed: upserted_ids tells which likes were
+        # really inserted; deletes are only counted in aggregate.
+        counts: Dict[str, int] = defaultdict(int)
+        scores: Dict[str, float] = defaultdict(float)
+        for index in result.upserted_ids:
+            project_id, _ = keys[index]
+            counts[project_id] += 1
+            scores[project_id] += like_score(batch[keys[index]].created_at)
+
+        deletes = [key for key in keys if not batch[key].liked]
+        recount = set()
+        if result.deleted_count == len(deletes):
+            for key in deletes:
+                counts[key[0]] -= 1
+                if batch[key].liked_at:
+                    scores[key[0]] -= like_score(batch[key].liked_at)
+        else:
+            recount = {project_id for project_id, _ in deletes}
+        return counts, scores, recount
+
+    def _add_counters(self, counts: Dict[str, int], scores: Dict[str, float], recount: Set[str]) -> None:
+        for project_id in recount:
+            # A recount is absolute and covers any delta still unapplied
+            self._counters.pop(project_id, None)
+            self._recounts.add(project_id)
+        for project_id in set(counts) | set(scores):
+            if project_id in self._recounts:
+                continue
+            count, score = self._counters.get(project_id, (0, 0.0))
+            self._counters[project_id] = (count + counts.get(project_id, 0), score + scores.get(project_id, 0.0))
+
+    async def _write_counters(self) -> None:
+        """
+        Apply the unapplied counter changes with one bulk_write on projects.
+        Entries whose update failed stay queued; the rest are dropped.
+        """
+        counters = {
+            project_id: change
+            for project_id, change in self._counters.items()
+            if change[0] or change[1]
+        }
+        recounts = sorted(self._recounts)
+        if not counters and not recounts:
+            self._counters = {}
+            return
+
+        updated_at = datetime.now()
+        project_ids = list(counters)
+        updates = [
+            UpdateOne(
+                {"id": project_id},
+                {
+                    "$inc": {"likes_count": count, "trending_score": score},
+                    "$set": {"updated_at": updated_at}
+                }
+            )
+            for project_id, (count, score) in counters.items()
+        ]
+        for project_id in recounts:
+            likes = await self._db.project_likes.count_documents({"project_id": project_id})
+            project_ids.append(project_id)
+            updates.append(UpdateOne({"id": project_id}, {"$set": {"likes_count": likes, "updated_at": updated_at}}))
+
+        try:
+            await self._db.projects.bulk_write(updates, ordered=False)
+        except BulkWriteError as exc:
+            # Unordered: only the updates listed in writeErrors were skipped
+            failed = {project_ids[error["index"]] for error in exc.details.get("writeErrors", [])}
+            self._counters = {project_id: change for project_id, change in counters.items() if project_id in failed}
+            self._recounts = {project_id for project_id in recounts if project_id in failed}
+            await self._invalidate(project_id for project_id in project_ids if project_id not in failed)
+            raise
+        self._counters, self._recounts = {}, set()
+        await self._invalidate(project_ids)
+
+    async def _invalidate(self, project_ids) -> None:
+        """
+        Drop cached responses of projects whose counters were written. The
+        counters are already committed, so a cache failure must not requeue
+        them; the entries expire with their TTL instead.
+        """
+        for project_id in project_ids:
+            try:
+                await invalidate_project(project_id)
+            except Exception:
+                logger.exception("Invalidating cached responses of project %s failed", project_id)
+
+
+like_buffer = LikeBuffer()
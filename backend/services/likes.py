@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from models.project import ProjectLike
+from services.like_buffer import like_buffer
+from services.trending import like_score
+
+LIKES_PROJECTION = {"_id": 0, "likes_count": 1}
+
+
+async def toggle_like(db, project_id: str, user_id: str) -> Optional[dict]:
+    """
+    Flip the like of a user on a project and return the new state, or None if
+    the project does not exist.
+
+    Membership is decided atomically by the unique (project_id, user_id) index
+    on project_likes: a like is either removed or inserted, never both, so
+    concurrent toggles cannot double count. The counter and the trending
+    score are then moved with a single find_one_and_update that also returns
+    the count.
+    """
+    if like_buffer.enabled:
+        return await toggle_like_buffered(db, project_id, user_id)
+
+    like_key = {"project_id": project_id, "user_id": user_id}
+
+    removed = await db.project_likes.find_one_and_delete(like_key, projection={"_id": 0, "created_at": 1})
+    if removed is not None:
+        liked, delta = False, -1
+        score = -like_score(removed["created_at"]) if removed.get("created_at") else 0.0
+    else:
+        like = ProjectLike(**like_key)
+        try:
+            await db.project_likes.insert_one(like.model_dump())
+        except DuplicateKeyError:
+            # A concurrent toggle from the same user inserted the like first
+            project = await db.projects.find_one({"id": project_id}, LIKES_PROJECTION)
+            if project is None:
+                return None
+            return {"liked": True, "likes": project.get("likes_count", 0)}
+        liked, delta = True, 1
+        score = like_score(like.created_at)
+
+    project = await db.projects.find_one_and_update(
+        {"id": project_id},
+        {"$inc": {"likes_count": delta, "trending_score": score}, "$set": {"updated_at": datetime.now()}},
+        projection=LIKES_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    if project is None:
+        if liked:
+            await db.project_likes.delete_one(like_key)
+        return None
+
+    return {"liked": liked, "likes": project["likes_count"]}
+
+
+async def toggle_like_buffered(db, project_id: str, user_id: str) -> Optional[dict]:
+    """
+    Write-behind variant of toggle_like: the toggle is recorded in the like
+    buffer and the count returned includes this worker's unflushed toggles
+    """
+    project = await db.projects.find_one({"id": project_id}, LIKES_PROJECTION)
+    if project is None:
+        return None
+    liked = await like_buffer.toggle(db, project_id, user_id)
+    if like_buffer.durability == "flushed":
+        project = await db.projects.find_one({"id": project_id}, LIKES_PROJECTION) or project
+    return {"liked": liked, "likes": project.get("likes_count", 0) + like_buffer.pending_delta(project_id)}
+
+
+async def get_like_state(db, project_id: str, user_id: str) -> Optional[dict]:
+    """
+    Return whether the user likes the project and its like count, or None if
+    the project does not exist, without loading any like lists
+    """
+    project, existing_like = await asyncio.gather(
+        db.projects.find_one({"id": project_id}, LIKES_PROJECTION),
+        db.project_likes.find_one({"project_id": project_id, "user_id": user_id}, {"_id": 1})
+    )
+    if project is None:
+        return None
+    liked = like_buffer.state(project_id, user_id)
+    return {
+        "liked": existing_like is not None if liked is None else liked,
+        "likes": project.get("likes_count", 0) + like_buffer.pending_delta(project_id)
+    }
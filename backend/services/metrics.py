@@ -0,0 +1,189 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[tuple(labels)] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(tuple(labels))
+            if series is None:
+                series = self._series[tuple(labels)] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {bucket_count}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+                lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Minimal Prometheus text-format registry. Gauges are collected on demand
+    from callbacks so caches and pools can report their live state.
+    """
+
+    def __init__(self):
+        self._metrics: list = []
+        self._gauges: List[Tuple[str, str, Callable[[], Dict[Tuple[Tuple[str, str], ...], float]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge_callback(self, name: str, documentation: str, collect: Callable[[], Dict]) -> None:
+        """
+        collect() returns {((label, value), ...): number}
+        """
+        self._gauges.append((name, documentation, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, collect in self._gauges:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in sorted(collect().items()):
+                names = tuple(label for label, _ in labels)
+                values = tuple(value for _, value in labels)
+                lines.append(f"{name}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "flancer_http_requests_total", "HTTP requests served", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "flancer_http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+db_commands = registry.counter(
+    "flancer_db_commands_total", "MongoDB commands issued", ("command",)
+)
+db_command_duration = registry.histogram(
+    "flancer_db_command_duration_seconds", "MongoDB command latency", ("command",)
+)
+db_commands_per_request = registry.histogram(
+    "flancer_db_commands_per_request", "MongoDB commands issued per HTTP request", ("route",), COUNT_BUCKETS
+)
+db_time_per_request = registry.histogram(
+    "flancer_db_time_per_request_seconds", "Total MongoDB time per HTTP request", ("route",)
+)
+slow_queries = registry.counter(
+    "flancer_db_slow_queries_total", "MongoDB commands slower than SLOW_QUERY_MS", ("command",)
+)
+singleflight_calls = registry.counter(
+    "flancer_singleflight_calls_total", "Calls that started a single-flight load", ("group",)
+)
+singleflight_coalesced = registry.counter(
+    "flancer_singleflight_coalesced_total", "Calls that joined an identical in-flight load", ("group",)
+)
+like_flush_duration = registry.histogram(
+    "flancer_like_flush_seconds", "Time to write one batch of buffered like toggles"
+)
+like_flush_ops = registry.histogram(
+    "flancer_like_flush_ops", "Like toggles written per flush after coalescing", (), COUNT_BUCKETS
+)
+like_toggles_buffered = registry.counter(
+    "flancer_like_toggles_buffered_total", "Like toggles accepted into the write-behind buffer"
+)
+like_toggles_coalesced = registry.counter(
+    "flancer_like_toggles_coalesced_total", "Buffered like toggles cancelled out before reaching MongoDB"
+)
+like_flush_failures = registry.counter(
+    "flancer_like_flush_failures_total", "Like flushes that failed and were re-queued"
+)
+
+
+def cache_gauges(caches: Dict[str, Callable[[], dict]]) -> Callable[[], Dict]:
+    """
+    Adapt cache .stats() callables into a gauge collector labelled by cache
+    and stat
+    """
+    def collect():
+        values = {}
+        for cache_name, stats in caches.items():
+            for stat, value in stats().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[(("cache", cache_name), ("stat", stat))] = value
+        return values
+    return collect
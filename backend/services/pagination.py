@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """
+    Encode the (created_at, id) position of the last item on a page as an
+    opaque url-safe token
+    """
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str], field: str = "created_at") -> dict:
+    """
+    Build the filter selecting everything after the cursor position for a
+    ``(field, id)`` descending sort
+    """
+    if not cursor:
+        return {}
+    created_at, item_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {field: {"$lt": created_at}},
+            {field: created_at, "id": {"$lt": item_id}}
+        ]
+    }
+
+
+def next_cursor(items: list, limit: int, field: str = "created_at") -> Optional[str]:
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last[field], last["id"])
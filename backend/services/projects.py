@@ -0,0 +1,392 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from models.project import Comment
+from services.pagination import keyset_filter, next_cursor
+
+# Fields a project response is built from; used as the Mongo projection so
+# reads never pull fields the API does not return.
+PROJECT_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "title": 1,
+    "description": 1,
+    "budget": 1,
+    "tech_stack": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "user_id": 1,
+    "images": 1,
+    "likes_count": 1,
+    "comment_count": 1,
+}
+
+USER_SUMMARY_PROJECTION = {"_id": 0, "id": 1, "name": 1, "image": 1}
+
+# Public response fields, in response order, and the stored fields each one
+# is built from; drives sparse fieldsets (fields=...)
+RESPONSE_FIELDS = {
+    "id": ("id",),
+    "title": ("title",),
+    "description": ("description",),
+    "budget": ("budget",),
+    "tech_stack": ("tech_stack",),
+    "status": ("status",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at", "created_at"),
+    "user_id": ("user_id",),
+    "images": ("images",),
+    "likes": ("likes_count",),
+    "comment_count": ("comment_count",),
+    "owner": ("user_id",),
+    "comments": ("id",),
+}
+
+LIST_SORT = {"created_at": -1, "id": -1}
+
+# Lower bounds of the budget facet buckets; the last bucket is open ended.
+BUDGET_BUCKETS = [0, 500, 1000, 5000, 10000, 50000]
+TECH_FACET_LIMIT = 20
+
+
+def build_project_filter(
+    tech_stack: Optional[str] = None,
+    min_budget: Optional[int] = None,
+    max_budget: Optional[int] = None,
+    status: Optional[str] = None
+) -> dict:
+    """
+    Translate the public list filters into a Mongo query
+    """
+    filter_query = {}
+
+    if tech_stack:
+        tech_stack_list = [tech.strip() for tech in tech_stack.split(",") if tech.strip()]
+        filter_query["tech_stack"] = {"$in": tech_stack_list}
+
+    budget_filter = {}
+    if min_budget is not None:
+        budget_filter["$gte"] = min_budget
+    if max_budget is not None:
+        budget_filter["$lte"] = max_budget
+    if budget_filter:
+        filter_query["budget"] = budget_filter
+
+    if status:
+        filter_query["status"] = getattr(status, "value", status)
+
+    return filter_query
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a comma separated fields= parameter into response field names
+    (id is always included), or None when every field is wanted
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - RESPONSE_FIELDS.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(field for field in RESPONSE_FIELDS if field in requested)
+
+
+def source_projection(fields: Iterable[str]) -> dict:
+    projection = {"_id": 0}
+    for field in fields:
+        for source in RESPONSE_FIELDS[field]:
+            projection[source] = 1
+    return projection
+
+
+def user_summary(user) -> dict:
+    return {
+        "id": user.id,
+        "name": user.name,
+        "image": user.image
+    }
+
+
+def project_response(doc: dict, owner: Optional[dict] = None) -> dict:
+    """
+    Shape a project document into the response dict in one pass, without
+    building a model first
+    """
+    return {
+        "id": doc["id"],
+        "title": doc["title"],
+        "description": doc["description"],
+        "budget": doc["budget"],
+        "tech_stack": doc.get("tech_stack") or [],
+        "status": doc["status"],
+        "created_at": doc["created_at"],
+        "updated_at": doc.get("updated_at") or doc["created_at"],
+        "user_id": doc["user_id"],
+        "images": doc.get("images") or [],
+        "likes": doc.get("likes_count", 0),
+        "comment_count": doc.get("comment_count", 0),
+        "owner": owner,
+        "comments": None,
+    }
+
+
+def project_pipeline(
+    match: dict,
+    sort: Optional[dict] = None,
+    skip: int = 0,
+    limit: int = 0,
+    latest_comments: int = 0,
+    fields: Optional[Iterable[str]] = None
+) -> List[dict]:
+    """
+    Build the aggregation that returns response-ready project documents: the
+    page is selected first so the lookups only run for the rows returned, then
+    the owner and the latest comments (with their authors) are joined in and
+    the result is projected to the response shape.
+
+    With a sparse fieldset the selected documents are trimmed to the stored
+    fields it needs before any lookup, and lookups it does not need are left
+    out.
+    """
+    pipeline = [{"$match": match}]
+    if sort:
+        pipeline.append({"$sort": sort})
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit:
+        pipeline.append({"$limit": limit})
+    if fields is not None:
+        pipeline.append({"$project": source_projection(fields)})
+    pipeline.extend(response_stages(latest_comments, fields=fields))
+    return pipeline
+
+
+def response_stages(
+    latest_comments: int = 0,
+    extra_fields: Optional[dict] = None,
+    fields: Optional[Iterable[str]] = None
+) -> List[dict]:
+    """
+    Stages joining the owner and latest comments onto already selected
+    project documents and projecting them to the response shape
+    """
+    include = set(RESPONSE_FIELDS) if fields is None else set(fields)
+    pipeline = []
+    if "owner" in include:
+        pipeline.append({
+            "$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "id",
+                "pipeline": [{"$project": USER_SUMMARY_PROJECTION}],
+                "as": "owner"
+            }
+        })
+
+    comments = {"$literal": None}
+    if latest_comments > 0 and "comments" in include:
+        pipeline.append({
+            "$lookup": {
+                "from": "comments",
+                "localField": "id",
+                "foreignField": "project_id",
+                "pipeline": [
+                    {"$sort": {"created_at": -1, "id": -1}},
+                    {"$limit": latest_comments},
+                    {
+                        "$lookup": {
+                            "from": "users",
+                            "localField": "user_id",
+                            "foreignField": "id",
+                            "pipeline": [{"$project": USER_SUMMARY_PROJECTION}],
+                            "as": "user"
+                        }
+                    },
+                    {"$unwind": "$user"},
+                    {"$project": {"_id": 0, "id": 1, "text": 1, "created_at": 1, "user": 1}},
+                ],
+                "as": "comments"
+            }
+        })
+        comments = "$comments"
+
+    projection = {
+        "id": 1,
+        "title": 1,
+        "description": 1,
+        "budget": 1,
+        "tech_stack": {"$ifNull": ["$tech_stack", []]},
+        "status": 1,
+        "created_at": 1,
+        "updated_at": {"$ifNull": ["$updated_at", "$created_at"]},
+        "user_id": 1,
+        "images": {"$ifNull": ["$images", []]},
+        "likes": {"$ifNull": ["$likes_count", 0]},
+        "comment_count": {"$ifNull": ["$comment_count", 0]},
+        "owner": {"$ifNull": [{"$arrayElemAt": ["$owner", 0]}, None]},
+        "comments": comments,
+    }
+    pipeline.append({
+        "$project": {
+            "_id": 0,
+            **{field: value for field, value in projection.items() if field in include},
+            **(extra_fields or {}),
+        }
+    })
+    return pipeline
+
+
+def search_pipeline(query: str, filter_query: dict, skip: int = 0, limit: int = 10) -> List[dict]:
+    """
+    Full-text search ranked by relevance, with the total hit count and the
+    tech stack, budget and status facets computed by a $facet stage over the
+    same matched set
+    """
+    page = [{"$sort": {"score": -1, "created_at": -1, "id": -1}}]
+    if skip:
+        page.append({"$skip": skip})
+    page.append({"$limit": limit})
+    page.extend(response_stages(extra_fields={"score": 1}))
+
+    return [
+        {"$match": {"$text": {"$search": query}, **filter_query}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {
+            "$facet": {
+                "results": page,
+                "total": [{"$count": "count"}],
+                "tech_stack": [
+                    {"$unwind": "$tech_stack"},
+                    {"$group": {"_id": "$tech_stack", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": TECH_FACET_LIMIT},
+                ],
+                "budget": [
+                    {
+                        "$bucket": {
+                            "groupBy": "$budget",
+                            "boundaries": BUDGET_BUCKETS + [float("inf")],
+                            "default": "other",
+                            "output": {"count": {"$sum": 1}}
+                        }
+                    },
+                ],
+                "status": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                    {"$sort": {"_id": 1}},
+                ],
+            }
+        },
+    ]
+
+
+async def search_projects(db, query: str, filter_query: dict, skip: int = 0, limit: int = 10) -> dict:
+    pipeline = search_pipeline(query, filter_query, skip, limit)
+    facets = (await db.projects.aggregate(pipeline).to_list(length=1))[0]
+
+    budget_facets = []
+    for bucket in facets["budget"]:
+        if bucket["_id"] == "other":
+            continue
+        index = BUDGET_BUCKETS.index(bucket["_id"])
+        upper = BUDGET_BUCKETS[index + 1] if index + 1 < len(BUDGET_BUCKETS) else None
+        budget_facets.append({"min": bucket["_id"], "max": upper, "count": bucket["count"]})
+
+    return {
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "results": facets["results"],
+        "facets": {
+            "tech_stack": [{"value": f["_id"], "count": f["count"]} for f in facets["tech_stack"]],
+            "budget": budget_facets,
+            "status": [{"value": f["_id"], "count": f["count"]} for f in facets["status"]],
+        }
+    }
+
+
+async def fetch_projects(
+    db,
+    match: dict,
+    sort: Optional[dict] = LIST_SORT,
+    skip: int = 0,
+    limit: int = 0,
+    latest_comments: int = 0,
+    fields: Optional[Iterable[str]] = None
+) -> List[dict]:
+    pipeline = project_pipeline(match, sort, skip, limit, latest_comments, fields)
+    return await db.projects.aggregate(pipeline).to_list(length=None)
+
+
+async def fetch_project(
+    db,
+    project_id: str,
+    latest_comments: int = 0,
+    fields: Optional[Iterable[str]] = None
+) -> Optional[dict]:
+    projects = await fetch_projects(
+        db,
+        {"id": project_id},
+        sort=None,
+        limit=1,
+        latest_comments=latest_comments,
+        fields=fields
+    )
+    return projects[0] if projects else None
+
+
+async def load_comment_authors(db, user_ids: Iterable[str]) -> Dict[str, dict]:
+    """
+    Load the public author info for a set of user ids in a single query
+    """
+    ids = list(set(user_ids))
+    if not ids:
+        return {}
+
+    authors = {}
+    cursor = db.users.find({"id": {"$in": ids}}, USER_SUMMARY_PROJECTION)
+    async for user in cursor:
+        authors[user["id"]] = {
+            "id": user["id"],
+            "name": user["name"],
+            "image": user.get("image", None)
+        }
+    return authors
+
+
+def format_comments(comments, authors: Dict[str, dict]) -> List[dict]:
+    formatted_comments = []
+    for comment in comments or []:
+        user_info = authors.get(comment.user_id)
+        if user_info:
+            formatted_comments.append({
+                "id": comment.id,
+                "text": comment.text,
+                "created_at": comment.created_at,
+                "user": user_info
+            })
+    return formatted_comments
+
+
+async def hydrate_comments(db, comments: List[Comment]) -> List[dict]:
+    authors = await load_comment_authors(db, {comment.user_id for comment in comments})
+    return format_comments(comments, authors)
+
+
+async def list_comments_page(db, project_id: str, cursor: Optional[str], limit: int) -> dict:
+    """
+    Keyset-paginated comments of a project, newest first
+    """
+    query = {"project_id": project_id}
+    query.update(keyset_filter(cursor))
+    comment_docs = await db.comments.find(query).sort(
+        [("created_at", -1), ("id", -1)]
+    ).limit(limit).to_list(length=None)
+
+    items = await hydrate_comments(db, [Comment(**doc) for doc in comment_docs])
+    return {
+        "items": items,
+        "next_cursor": next_cursor(comment_docs, limit)
+    }
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Request, Response
+
+from services.cache import CacheBackend, cache_backend
+from services.serialization import FastJSONResponse
+
+PROJECT_CACHE_TTL = float(os.getenv("PROJECT_CACHE_TTL", "300"))
+PROJECT_CACHE_MAX_AGE = int(os.getenv("PROJECT_CACHE_MAX_AGE", "0"))
+# TTL for responses loaded from a possibly lagging secondary, which may miss
+# writes whose invalidation already ran
+SECONDARY_READ_CACHE_TTL = float(os.getenv("SECONDARY_READ_CACHE_TTL", "5"))
+
+# Tag carried by every cached project list page; project and user tags are
+# added per row so single-project changes only drop the pages showing it.
+LIST_TAG = "projects:list"
+
+
+def project_tag(project_id: str) -> str:
+    return f"project:{project_id}"
+
+
+def user_tag(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def response_tags(projects: List[dict]) -> List[str]:
+    """
+    Tags for a rendered response: every project shown, plus every user whose
+    name or avatar is embedded as an owner or comment author
+    """
+    tags = set()
+    for project in projects:
+        tags.add(project_tag(project["id"]))
+        if project.get("owner"):
+            tags.add(user_tag(project["owner"]["id"]))
+        for comment in project.get("comments") or []:
+            tags.add(user_tag(comment["user"]["id"]))
+    return sorted(tags)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def dumps(self) -> bytes:
+        return b"\n".join([self.etag.encode(), json.dumps(self.headers).encode(), self.body])
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        etag, headers, body = raw.split(b"\n", 2)
+        return cls(body=body, etag=etag.decode(), headers=json.loads(headers))
+
+    def to_response(self, request: Request) -> Response:
+        headers = {
+            **self.headers,
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={PROJECT_CACHE_MAX_AGE}, must-revalidate",
+        }
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """
+    Rendered JSON responses keyed by normalized query, stored in the shared
+    cache backend with tags so writes drop exactly the entries that show the
+    changed data
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float = PROJECT_CACHE_TTL):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _key(self, parts) -> str:
+        digest = hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    async def get(self, parts) -> Optional[CachedResponse]:
+        raw = await self.backend.get(self._key(parts))
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def version(self) -> int:
+        """
+        Invalidation version to read before loading and pass to store()
+        """
+        return await self.backend.version()
+
+    async def store(
+        self,
+        parts,
+        content,
+        tags: Iterable[str],
+        headers: Optional[Dict[str, str]] = None,
+        since: Optional[int] = None,
+        ttl: Optional[float] = None
+    ) -> CachedResponse:
+        """
+        Render and cache a response. With since, the entry is still returned
+        but not cached when one of its tags was invalidated during the load.
+        ttl overrides the cache's own TTL for this entry.
+        """
+        body = FastJSONResponse(content).body
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = CachedResponse(body=body, etag=etag, headers=headers or {})
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        await self.backend.set(self._key(parts), entry.dumps(), ttl, tags, since=since)
+        return entry
+
+
+project_response_cache = ResponseCache(cache_backend, namespace="responses:projects")
+
+
+async def invalidate_project(project_id: str, lists: bool = False) -> None:
+    """
+    Drop the cached responses showing a project, in every worker. Pass
+    lists=True when the change can move the project in or out of list pages
+    (create, delete, or a change to a filtered or sorted field)
+    """
+    tags = [project_tag(project_id)]
+    if lists:
+        tags.append(LIST_TAG)
+    await cache_backend.invalidate_tags(*tags)
+
+
+async def invalidate_project_lists() -> None:
+    await cache_backend.invalidate_tags(LIST_TAG)
+
+
+async def invalidate_user_data(user_id: str) -> None:
+    """
+    Drop cached responses embedding a user's name or avatar, and the user's
+    entry in every worker's local user cache
+    """
+    await cache_backend.invalidate_tags(user_tag(user_id))
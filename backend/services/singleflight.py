@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from services.metrics import singleflight_calls, singleflight_coalesced
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent loads: while a load for a key is running,
+    other callers for the same key await it instead of starting their own,
+    and all of them get its result or exception.
+
+    The load runs in its own task and callers await it through
+    asyncio.shield, so a caller that is cancelled (for example because its
+    client disconnected) neither cancels the load for the others nor leaves
+    them waiting. Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            singleflight_coalesced.inc(self.group)
+            return await asyncio.shield(task)
+
+        singleflight_calls.inc(self.group)
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
@@ -0,0 +1,120 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from services.projects import project_pipeline
+
+# Writes stamp updated_at from the app clock before they commit, so a slow
+# write can land behind a position a client has already synced past. Changes
+# younger than this are held back until the next poll.
+CHANGES_SETTLE_SECONDS = float(os.getenv("CHANGES_SETTLE_SECONDS", "2"))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+CHANGES_SORT = {"updated_at": 1, "id": 1}
+TOMBSTONES_SORT = [("deleted_at", 1), ("id", 1)]
+
+Position = Optional[Tuple[datetime, str]]
+
+
+def _encode_position(position: Position) -> Optional[list]:
+    return [position[0].isoformat(), position[1]] if position else None
+
+
+def _naive_datetime(raw: str) -> datetime:
+    # Tokens are issued with naive app-clock datetimes; an offset means the
+    # token was not issued here and could not be compared with them
+    value = datetime.fromisoformat(raw)
+    if value.tzinfo is not None:
+        raise ValueError("sync token datetimes carry no UTC offset")
+    return value
+
+
+def _decode_position(raw) -> Position:
+    if raw is None:
+        return None
+    at, item_id = raw
+    return _naive_datetime(at), str(item_id)
+
+
+def encode_sync_token(projects: Position, tombstones: Position, issued_at: datetime) -> str:
+    """
+    Encode the (updated_at, id) position in the projects and the
+    (deleted_at, id) position in the tombstones as an opaque url-safe token
+    """
+    raw = json.dumps(
+        {
+            "p": _encode_position(projects),
+            "t": _encode_position(tombstones),
+            "i": issued_at.isoformat(),
+        },
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[Position, Position, datetime]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        return _decode_position(raw["p"]), _decode_position(raw["t"]), _naive_datetime(raw["i"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def _after(field: str, position: Position, until: datetime) -> dict:
+    """
+    Everything after the position for an ascending (field, id) sort, up to
+    the settle horizon
+    """
+    query = {field: {"$lt": until}}
+    if position is None:
+        return query
+    at, item_id = position
+    return {
+        "$and": [
+            query,
+            {"$or": [{field: {"$gt": at}}, {field: at, "id": {"$gt": item_id}}]},
+        ]
+    }
+
+
+async def list_changes(db, since: Optional[str], limit: int) -> dict:
+    """
+    Projects created or updated and ids deleted after the token position,
+    oldest first, with the token to pass next time. Without a token every
+    live project is returned (a full sync) and deletions start from now.
+    """
+    now = datetime.now()
+    until = now - timedelta(seconds=CHANGES_SETTLE_SECONDS)
+    if since:
+        project_position, tombstone_position, issued_at = decode_sync_token(since)
+        if issued_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(status_code=410, detail="Sync token expired; resync without since")
+    else:
+        project_position, tombstone_position, issued_at = None, (until, ""), now
+
+    changed: List[dict] = await db.projects.aggregate(
+        project_pipeline(_after("updated_at", project_position, until), CHANGES_SORT, limit=limit + 1)
+    ).to_list(length=None)
+    tombstones = await db.project_tombstones.find(
+        _after("deleted_at", tombstone_position, until),
+        {"_id": 0, "id": 1, "deleted_at": 1}
+    ).sort(TOMBSTONES_SORT).limit(limit + 1).to_list(length=None)
+
+    has_more = len(changed) > limit or len(tombstones) > limit
+    changed, tombstones = changed[:limit], tombstones[:limit]
+    if changed:
+        project_position = (changed[-1]["updated_at"], changed[-1]["id"])
+    if tombstones:
+        tombstone_position = (tombstones[-1]["deleted_at"], tombstones[-1]["id"])
+
+    return {
+        "changed": changed,
+        "deleted": [tombstone["id"] for tombstone in tombstones],
+        "next": encode_sync_token(project_position, tombstone_position, now),
+        "has_more": has_more,
+    }
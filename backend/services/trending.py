@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_LIKE_WEIGHT = float(os.getenv("TRENDING_LIKE_WEIGHT", "1"))
+TRENDING_COMMENT_WEIGHT = float(os.getenv("TRENDING_COMMENT_WEIGHT", "2"))
+TRENDING_REBUILD_INTERVAL = float(os.getenv("TRENDING_REBUILD_INTERVAL", "600"))
+# Activity older than this many half-lives contributes < 1/1024 and is ignored by rebuilds
+TRENDING_WINDOW_HALF_LIVES = 10
+
+TRENDING_SORT = {"trending_score": -1, "id": -1}
+
+# Only the worker holding this lease in the locks collection runs rebuilds;
+# it is renewed on every cycle and taken over once it expires
+REBUILD_LEASE_ID = "trending_rebuild"
+WORKER_ID = uuid.uuid4().hex
+
+# Scores are stored as sum(weight * 2 ** ((t - epoch) / half_life)) so an
+# event never has to be re-decayed: newer events simply weigh more. The epoch
+# moves forward every ERA_HALF_LIVES half-lives, which keeps the exponent far
+# from float overflow; every worker derives the same epoch from the clock and
+# a rebuild rescores everything when a new era starts.
+ERA_HALF_LIVES = 256
+ORIGIN = datetime(2025, 1, 1)
+
+
+def _half_life_seconds() -> float:
+    return TRENDING_HALF_LIFE_HOURS * 3600
+
+
+def current_epoch(now: Optional[datetime] = None) -> datetime:
+    era_seconds = _half_life_seconds() * ERA_HALF_LIVES
+    elapsed = ((now or datetime.now()) - ORIGIN).total_seconds()
+    return ORIGIN + timedelta(seconds=(elapsed // era_seconds) * era_seconds)
+
+
+def event_score(weight: float, at: datetime, epoch: Optional[datetime] = None) -> float:
+    """
+    Score contributed by an event of the given weight that happened at `at`.
+    `at` is truncated to milliseconds, as MongoDB stores it, so the score
+    added for a like from its in-memory time cancels exactly against the one
+    subtracted later from the stored time.
+    """
+    epoch = epoch or current_epoch()
+    at = at.replace(microsecond=at.microsecond // 1000 * 1000)
+    return weight * 2 ** ((at - epoch).total_seconds() / _half_life_seconds())
+
+
+def like_score(at: datetime) -> float:
+    return event_score(TRENDING_LIKE_WEIGHT, at)
+
+
+def comment_score(at: datetime) -> float:
+    return event_score(TRENDING_COMMENT_WEIGHT, at)
+
+
+def _decayed_sum_lookup(collection: str, since: datetime, epoch: datetime, weight: float, name: str) -> dict:
+    return {
+        "$lookup": {
+            "from": collection,
+            "localField": "id",
+            "foreignField": "project_id",
+            "pipeline": [
+                {"$match": {"created_at": {"$gte": since}}},
+                {"$group": {
+                    "_id": None,
+                    "score": {"$sum": {"$multiply": [weight, {"$pow": [
+                        2,
+                        {"$divide": [{"$subtract": ["$created_at", epoch]}, _half_life_seconds() * 1000]}
+                    ]}]}}
+                }}
+            ],
+            "as": name
+        }
+    }
+
+
+def rebuild_pipeline(now: Optional[datetime] = None) -> list:
+    """
+    Recompute every project's score from recent likes and comments and write
+    it back onto the projects with $merge
+    """
+    now = now or datetime.now()
+    epoch = current_epoch(now)
+    since = now - timedelta(seconds=_half_life_seconds() * TRENDING_WINDOW_HALF_LIVES)
+    return [
+        {"$project": {"_id": 0, "id": 1, "previous": {"$ifNull": ["$trending_score", 0]}}},
+        _decayed_sum_lookup("project_likes", since, epoch, TRENDING_LIKE_WEIGHT, "like_score"),
+        _decayed_sum_lookup("comments", since, epoch, TRENDING_COMMENT_WEIGHT, "comment_score"),
+        {"$project": {
+            "id": 1,
+            "previous": 1,
+            "trending_score": {"$add": [
+                {"$ifNull": [{"$first": "$like_score.score"}, 0]},
+                {"$ifNull": [{"$first": "$comment_score.score"}, 0]}
+            ]}
+        }},
+        # Only write scores that moved, so idle projects cost no write
+        {"$match": {"$expr": {"$ne": ["$trending_score", "$previous"]}}},
+        {"$merge": {
+            "into": "projects",
+            "on": "id",
+            "whenMatched": [{"$set": {"trending_score": "$$new.trending_score"}}],
+            "whenNotMatched": "discard"
+        }},
+    ]
+
+
+async def rebuild_trending(db) -> None:
+    started = time.perf_counter()
+    await db.projects.aggregate(rebuild_pipeline()).to_list(None)
+    logger.info("Rebuilt trending scores in %.1fms", (time.perf_counter() - started) * 1000)
+
+
+async def acquire_rebuild_lease(db, now: Optional[datetime] = None) -> bool:
+    """
+    Take or renew the rebuild lease for this worker; False while another
+    worker holds an unexpired one
+    """
+    now = now or datetime.now()
+    try:
+        await db.locks.update_one(
+            {
+                "_id": REBUILD_LEASE_ID,
+                "$or": [{"owner": WORKER_ID}, {"expires_at": {"$lte": now}}]
+            },
+            {"$set": {
+                "owner": WORKER_ID,
+                "expires_at": now + timedelta(seconds=TRENDING_REBUILD_INTERVAL * 2)
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The upsert lost to a live lease held by another worker
+        return False
+    return True
+
+
+async def run_trending_rebuilds(db) -> None:
+    """
+    Background task: rebuild at startup, then every TRENDING_REBUILD_INTERVAL
+    seconds and whenever a new scoring era begins. Incremental updates from
+    likes and comments keep the ranking fresh in between; rebuilds drop
+    activity that has decayed away and correct any drift.
+
+    Every worker runs the loop, but only the holder of the rebuild lease
+    rebuilds; the others take over if it stops renewing.
+    """
+    while True:
+        try:
+            if await acquire_rebuild_lease(db):
+                await rebuild_trending(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Trending rebuild failed")
+
+        now = datetime.now()
+        next_era = current_epoch(now) + timedelta(seconds=_half_life_seconds() * ERA_HALF_LIVES)
+        await asyncio.sleep(max(1.0, min(TRENDING_REBUILD_INTERVAL, (next_era - now).total_seconds())))
@@ -0,0 +1,116 @@
+import asyncio
+
+import fakeredis
+
+from services.cache import MemoryCacheBackend, RedisCacheBackend
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def redis_backend(server) -> RedisCacheBackend:
+    return RedisCacheBackend(fakeredis.FakeAsyncRedis(server=server), prefix="test")
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_redis_store_and_invalidate():
+    async def scenario():
+        backend = redis_backend(fakeredis.FakeServer())
+        assert await backend.set("page", b"body", 60, ["project:1", "projects:list"])
+        assert await backend.get("page") == b"body"
+
+        await backend.invalidate_tags("project:1")
+        assert await backend.get("page") is None
+        assert await backend.client.exists("test:tag:project:1") == 0
+        await backend.close()
+
+    run(scenario())
+
+
+def test_redis_store_skipped_after_concurrent_invalidation():
+    async def scenario():
+        backend = redis_backend(fakeredis.FakeServer())
+        since = await backend.version()
+        await backend.invalidate_tags("project:1")
+
+        assert not await backend.set("page", b"stale", 60, ["project:1"], since=since)
+        assert await backend.get("page") is None
+        assert await backend.set("other", b"body", 60, ["project:2"], since=since)
+        await backend.close()
+
+    run(scenario())
+
+
+def test_redis_invalidations_reach_other_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        publisher, subscriber = redis_backend(server), redis_backend(server)
+        received = []
+        publisher.add_listener(lambda tags: received.append(("publisher", tags)))
+        subscriber.add_listener(lambda tags: received.append(("subscriber", tags)))
+        await subscriber.start()
+        for _ in range(200):
+            if dict(await publisher.client.pubsub_numsub(publisher.channel)).get(publisher.channel.encode()):
+                break
+            await asyncio.sleep(0.01)
+
+        await publisher.invalidate_tags("user:1")
+        await wait_for(lambda: ("subscriber", ["user:1"]) in received)
+        assert ("publisher", ["user:1"]) in received
+        await subscriber.close()
+        await publisher.close()
+
+    run(scenario())
+
+
+def test_memory_tag_index_pruned_on_eviction():
+    async def scenario():
+        backend = MemoryCacheBackend(maxsize=2)
+        await backend.set("a", b"1", 60, ["tag:a"])
+        await backend.set("b", b"2", 60, ["tag:b"])
+        await backend.set("c", b"3", 60, ["tag:c"])
+
+        assert await backend.get("a") is None
+        assert set(backend._tags) == {"tag:b", "tag:c"}
+
+    run(scenario())
+
+
+def test_memory_tag_index_pruned_on_expiry():
+    async def scenario():
+        backend = MemoryCacheBackend()
+        await backend.set("a", b"1", 0.01, ["tag:a", "projects:list"])
+        await asyncio.sleep(0.02)
+
+        assert await backend.get("a") is None
+        assert not backend._tags
+
+    run(scenario())
+
+
+def test_redis_outage_fails_open():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        backend = redis_backend(server)
+        received = []
+        backend.add_listener(received.append)
+        server.connected = False
+
+        assert await backend.get("page") is None
+        assert not await backend.set("page", b"body", 60, ["project:1"], since=await backend.version())
+        await backend.invalidate_tags("user:1")
+        assert received == [["user:1"]]
+        assert backend.stats()["errors"] == 5
+
+        server.connected = True
+        await backend.close()
+
+    run(scenario())
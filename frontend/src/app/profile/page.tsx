@@ -270,7 +270,7 @@ function ProjectCard({ project, index }: { project: Project; index: number }) {
                         </button>
                         <button className="flex items-center gap-1 text-xs text-gray-600 hover:text-blue-600 dark:text-gray-300 dark:hover:text-blue-400 sm:text-sm">
                             <MessageCircle className="h-3 w-3 sm:h-4 sm:w-4" />
-                            <span>{project.comments?.length || 0}</span>
+                            <span>{project.comment_count || 0}</span>
                         </button>
                     </div>
 
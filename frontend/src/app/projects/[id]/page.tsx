@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useRouter, useParams } from "next/navigation";
 import { motion } from "framer-motion";
 import {
@@ -32,6 +32,11 @@ export default function ProjectPage() {
     const [comment, setComment] = useState("");
     const [submittingComment, setSubmittingComment] = useState(false);
     const [comments, setComments] = useState<Comment[]>([]);
+    const [commentCount, setCommentCount] = useState(0);
+    const [commentsCursor, setCommentsCursor] = useState<string | null>(null);
+    const [loadingComments, setLoadingComments] = useState(false);
+    // Comments arrive both from our own POST and from the live stream
+    const seenCommentIds = useRef(new Set<string>());
     const [liked, setLiked] = useState(false);
     const [likeCount, setLikeCount] = useState(0);
     const [currentImageIndex, setCurrentImageIndex] = useState(0);
@@ -48,10 +53,16 @@ export default function ProjectPage() {
     useEffect(() => {
         const fetchProjectDetails = async () => {
             try {
-                const projectData = await apiClient.fetchProject(
-                    params.id as string,
+                const [projectData, commentPage] = await Promise.all([
+                    apiClient.fetchProject(params.id as string),
+                    apiClient.fetchComments(params.id as string),
+                ]);
+                seenCommentIds.current = new Set(
+                    commentPage.items.map((c) => c.id),
                 );
-                setComments(projectData.comments || []);
+                setComments(commentPage.items);
+                setCommentsCursor(commentPage.next_cursor);
+                setCommentCount(projectData.comment_count || 0);
                 setLikeCount(projectData.likes || 0);
             } catch (error) {
                 console.error("Error fetching project:", error);
@@ -63,6 +74,43 @@ export default function ProjectPage() {
         }
     }, [params.id, session?.user?.id]);
 
+    const addCommentOnce = (newComment: Comment) => {
+        if (seenCommentIds.current.has(newComment.id)) return;
+        seenCommentIds.current.add(newComment.id);
+        setComments((prevComments) => [newComment, ...prevComments]);
+        setCommentCount((prev) => prev + 1);
+    };
+
+    const handleLoadMoreComments = async () => {
+        if (!commentsCursor) return;
+
+        try {
+            setLoadingComments(true);
+            const page = await apiClient.fetchComments(
+                params.id as string,
+                commentsCursor,
+            );
+            const older = page.items.filter(
+                (c) => !seenCommentIds.current.has(c.id),
+            );
+            older.forEach((c) => seenCommentIds.current.add(c.id));
+            setComments((prevComments) => [...prevComments, ...older]);
+            setCommentsCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Error loading comments:", error);
+        } finally {
+            setLoadingComments(false);
+        }
+    };
+
+    useEffect(() => {
+        if (!params.id) return;
+        return apiClient.subscribeToProject(params.id as string, {
+            onLikes: setLikeCount,
+            onComment: addCommentOnce,
+        });
+    }, [params.id]);
+
     const handleMarkCompleted = async () => {
         if (!session) {
             router.push("/sign-in");
@@ -111,11 +159,8 @@ export default function ProjectPage() {
                 comment,
             );
 
-            // Add comment to local state
-            setComments((prevComments) => [
-                ...prevComments,
-                newCommentResponse,
-            ]);
+            // Add comment to local state unless the live stream already did
+            addCommentOnce(newCommentResponse);
             setComment("");
         } catch (error) {
             console.error("Error adding comment:", error);
@@ -395,7 +440,7 @@ export default function ProjectPage() {
                     >
                         <div className="mb-4 flex items-center justify-between">
                             <h2 className="text-xl font-bold">
-                                Comments ({comments.length})
+                                Comments ({commentCount})
                             </h2>
 
                             <button
@@ -535,6 +580,21 @@ export default function ProjectPage() {
                                 ))
                             )}
                         </div>
+
+                        {commentsCursor && (
+                            <div className="mt-6 text-center">
+                                <button
+                                    onClick={handleLoadMoreComments}
+                                    disabled={loadingComments}
+                                    className="inline-flex items-center font-medium text-blue-600 hover:text-blue-500 disabled:opacity-50 dark:text-blue-400"
+                                >
+                                    {loadingComments && (
+                                        <Loader2 className="mr-2 h-4 w-4 animate-spin" />
+                                    )}
+                                    Load more comments
+                                </button>
+                            </div>
+                        )}
                     </motion.div>
                 </div>
             </div>
@@ -13,7 +13,7 @@ interface ProjectCardProps {
 
 export default function ProjectCard({ project, index }: ProjectCardProps) {
     const likeCount = project.likes ?? 0;
-    const commentCount = project.comments?.length ?? 0;
+    const commentCount = project.comment_count ?? 0;
 
     return (
         <motion.div
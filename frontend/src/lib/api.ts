@@ -46,7 +46,9 @@ export interface Project {
     tech_stack: string[];
     status: "OPEN" | "COMPLETED";
     created_at: string;
+    updated_at?: string;
     likes?: number;
+    comment_count?: number;
     user_id: string;
     images?: string[];
     comments?: Comment[];
@@ -107,13 +109,36 @@ export const apiClient = {
         tech_stack?: string;
         min_budget?: number;
         max_budget?: number;
+        fields?: string;
     }) => {
         const response = await api.get<Project[]>("/projects", { params });
         return response.data;
     },
 
-    fetchProject: async (id: string) => {
-        const response = await api.get<Project>(`/projects/${id}`);
+    fetchTrendingProjects: async (limit?: number) => {
+        const response = await api.get<Project[]>("/projects/trending", {
+            params: { limit },
+        });
+        return response.data;
+    },
+
+    fetchProjectChanges: async (since?: string) => {
+        const response = await api.get<{
+            changed: Project[];
+            deleted: string[];
+            next: string;
+            has_more: boolean;
+        }>("/projects/changes", { params: { since } });
+        return response.data;
+    },
+
+    fetchProject: async (
+        id: string,
+        params?: { comments?: number; fields?: string },
+    ) => {
+        const response = await api.get<Project>(`/projects/${id}`, {
+            params,
+        });
         return response.data;
     },
 
@@ -161,6 +186,35 @@ export const apiClient = {
     },
 
     // Project comments
+    fetchComments: async (id: string, cursor?: string) => {
+        const response = await api.get<{
+            items: Comment[];
+            next_cursor: string | null;
+        }>(`/projects/${id}/comments`, { params: { cursor } });
+        return response.data;
+    },
+
+    subscribeToProject: (
+        id: string,
+        handlers: {
+            onLikes?: (likes: number) => void;
+            onComment?: (comment: Comment) => void;
+            onStatus?: (status: Project["status"]) => void;
+        },
+    ) => {
+        const source = new EventSource(`${API_URL}/api/projects/${id}/events`);
+        source.addEventListener("likes", (event) => {
+            handlers.onLikes?.(JSON.parse((event as MessageEvent).data).likes);
+        });
+        source.addEventListener("comment", (event) => {
+            handlers.onComment?.(JSON.parse((event as MessageEvent).data).comment);
+        });
+        source.addEventListener("status", (event) => {
+            handlers.onStatus?.(JSON.parse((event as MessageEvent).data).status);
+        });
+        return () => source.close();
+    },
+
     addComment: async (id: string, text: string) => {
         const response = await api.post<Comment>(`/projects/${id}/comments`, {
             text,